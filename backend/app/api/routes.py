@@ -1,48 +1,175 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import random
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.compression import accepted_codings, encoded_etag, etag_matches, negotiate
+from app.core.config import settings
 from app.core.database import get_db
 from app.services.quiz_service import QuizService
-from app.schemas.quiz import QuizResponse, QuizHistoryItem, URLValidationRequest, URLValidationResponse
-from typing import List
+from app.services.batch_runner import BatchRunner, get_job_status, is_running
+from app.services.jobs import GenerationJob, job_manager
+from app.services.llm_scheduler import LLMRateLimitError
+from app.schemas.quiz import QuizResponse, QuizGenerateRequest, QuizHistoryPage, QuizRefreshResponse, QuizSearchPage, URLValidationRequest, URLValidationResponse, BatchJobRequest, BatchJobResponse, GenerationJobResponse
+from typing import Literal, Optional
 
 router = APIRouter(prefix="/api/quiz", tags=["quiz"])
 
+def get_quiz_service(db: AsyncSession = Depends(get_db)) -> QuizService:
+    return QuizService(db)
+
+def get_generation_service(request: URLValidationRequest, db: AsyncSession = Depends(get_db)) -> QuizService:
+    return QuizService(db, source=request.source)
+
 @router.post("/validate-url", response_model=URLValidationResponse)
-async def validate_url(request: URLValidationRequest, db: Session = Depends(get_db)):
+async def validate_url(request: URLValidationRequest, quiz_service: QuizService = Depends(get_generation_service)):
     try:
-        quiz_service = QuizService(db)
-        result = quiz_service.validate_url(request.url)
+        result = await quiz_service.validate_url(request.url)
         return URLValidationResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/generate", response_model=QuizResponse)
-async def generate_quiz(request: URLValidationRequest, db: Session = Depends(get_db)):
+async def generate_quiz(request: QuizGenerateRequest, db: AsyncSession = Depends(get_db)):
+    seed = request.seed
+    if request.shuffle and seed is None:
+        seed = random.randrange(2 ** 31)
     try:
-        quiz_service = QuizService(db)
-        quiz = quiz_service.generate_quiz(request.url)
+        quiz = await QuizService(db, source=request.source).generate_quiz(
+            request.url, request.num_questions, request.difficulty_mix, seed
+        )
         return quiz
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except LLMRateLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(max(1, round(e.retry_after)))})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate quiz: {str(e)}")
 
-@router.get("/history", response_model=List[QuizHistoryItem])
-async def get_quiz_history(db: Session = Depends(get_db)):
+def _job_response(job: GenerationJob) -> GenerationJobResponse:
+    return GenerationJobResponse(
+        job_id=job.id,
+        status=job.status,
+        quiz_id=job.quiz_id,
+        error=job.error,
+        first_question_seconds=job.first_question_seconds
+    )
+
+@router.post("/jobs", response_model=GenerationJobResponse, status_code=202)
+async def create_generation_job(request: URLValidationRequest):
+    job = job_manager.submit(request.url, source=request.source)
+    return _job_response(job)
+
+@router.get("/jobs/{job_id}", response_model=GenerationJobResponse)
+async def get_generation_job(job_id: str):
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job)
+
+@router.get("/jobs/{job_id}/events")
+async def stream_generation_job(job_id: str, last_event_id: int = Header(0)):
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        job.stream(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/history", response_model=QuizHistoryPage)
+async def get_quiz_history(
+    limit: int = Query(settings.HISTORY_PAGE_SIZE, ge=1, le=settings.HISTORY_MAX_PAGE_SIZE),
+    cursor: Optional[int] = None,
+    quiz_service: QuizService = Depends(get_quiz_service)
+):
+    try:
+        return await quiz_service.get_all_quizzes(limit=limit, cursor=cursor)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/search", response_model=QuizSearchPage)
+async def search_quizzes(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(settings.SEARCH_PAGE_SIZE, ge=1, le=settings.HISTORY_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=settings.SEARCH_MAX_OFFSET),
+    quiz_service: QuizService = Depends(get_quiz_service)
+):
+    try:
+        return await quiz_service.search_quizzes(q, limit=limit, offset=offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/batch", response_model=BatchJobResponse)
+async def create_batch_job(request: BatchJobRequest, db: AsyncSession = Depends(get_db)):
     try:
-        quiz_service = QuizService(db)
-        return quiz_service.get_all_quizzes()
+        runner = BatchRunner(request.scrape_concurrency, request.llm_concurrency, request.source)
+        job = await runner.create_job(db, request.urls)
+        runner.start(job.id)
+        return await get_job_status(db, job.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/batch/{job_id}", response_model=BatchJobResponse)
+async def get_batch_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    status = await get_job_status(db, job_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return status
+
+@router.post("/batch/{job_id}/resume", response_model=BatchJobResponse)
+async def resume_batch_job(job_id: int, retry_failed: bool = False, db: AsyncSession = Depends(get_db)):
+    status = await get_job_status(db, job_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    if is_running(job_id):
+        raise HTTPException(status_code=409, detail="Batch job is already running")
+    BatchRunner().start(job_id, retry_failed=retry_failed)
+    return status
+
+@router.post("/{quiz_id}/refresh", response_model=QuizRefreshResponse)
+async def refresh_quiz(quiz_id: int, source: Literal["web", "dump"] = "web", db: AsyncSession = Depends(get_db)):
+    try:
+        result = await QuizService(db, source=source).refresh_quiz(quiz_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LLMRateLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(max(1, round(e.retry_after)))})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to refresh quiz: {str(e)}")
+    if result is None:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    if result.status == "in_progress":
+        raise HTTPException(status_code=409, detail="This quiz is already being refreshed")
+    return result
+
 @router.get("/{quiz_id}", response_model=QuizResponse)
-async def get_quiz_details(quiz_id: int, db: Session = Depends(get_db)):
+async def get_quiz_details(quiz_id: int, request: Request, quiz_service: QuizService = Depends(get_quiz_service)):
     try:
-        quiz_service = QuizService(db)
-        quiz = quiz_service.get_quiz_by_id(quiz_id)
-        if not quiz:
+        payload = await quiz_service.get_quiz_payload(quiz_id)
+        if not payload:
             raise HTTPException(status_code=404, detail="Quiz not found")
-        return quiz
+        
+        accept_encoding = request.headers.get("accept-encoding")
+        if payload.gzip is not None and "gzip" in accepted_codings(accept_encoding):
+            coding = "gzip"
+        elif len(payload.body) >= settings.COMPRESSION_MIN_BYTES:
+            coding = negotiate(accept_encoding)
+        else:
+            coding = None
+        etag = encoded_etag(payload.etag, coding) if coding else payload.etag
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        if coding == "gzip" and payload.gzip is not None:
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=payload.gzip, media_type="application/json", headers=headers)
+        headers["ETag"] = payload.etag
+        return Response(content=payload.body, media_type="application/json", headers=headers)
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,73 @@
+import httpx
+import re
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional
+from app.core.config import settings
+from app.services.llm_providers import create_llm
+
+if TYPE_CHECKING:
+    from langchain_core.prompts import PromptTemplate
+
+PROMPTS_DIR = Path(__file__).resolve().parents[2] / "prompts"
+PROMPT_BLOCK_PATTERN = re.compile(r'## Prompt Template\s*```[^\n]*\n(.*?)\n```', re.DOTALL)
+
+def load_prompt(path: Path) -> "PromptTemplate":
+    from langchain_core.prompts import PromptTemplate
+    
+    match = PROMPT_BLOCK_PATTERN.search(path.read_text(encoding="utf-8"))
+    if not match:
+        raise ValueError(f"No prompt template block found in {path.name}")
+    return PromptTemplate.from_template(match.group(1))
+
+class Clients:
+    def __init__(self):
+        self._http: Optional[httpx.AsyncClient] = None
+        self._llm = None
+        self._prompts: Dict[str, "PromptTemplate"] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def http(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._http is None or self._http.is_closed:
+                self._http = httpx.AsyncClient(
+                    timeout=settings.HTTP_TIMEOUT_SECONDS,
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_connections=settings.HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+                    )
+                )
+            return self._http
+    
+    @property
+    def llm(self):
+        with self._lock:
+            if self._llm is None:
+                self._llm = create_llm()
+            return self._llm
+    
+    def prompt(self, name: str) -> "PromptTemplate":
+        if not self._prompts:
+            self._prompts = {
+                path.stem[:-len("_prompt")]: load_prompt(path)
+                for path in sorted(PROMPTS_DIR.glob("*_prompt.md"))
+            }
+        return self._prompts[name]
+    
+    def startup(self):
+        if settings.CLIENT_WARMUP == "eager":
+            self.warm()
+    
+    def warm(self):
+        self.http
+        self.llm
+        self.prompt("quiz_generation")
+    
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+clients = Clients()
@@ -0,0 +1,106 @@
+import gzip
+from typing import Optional, Set
+from starlette.datastructures import Headers, MutableHeaders
+from app.core.config import settings
+from app.core.metrics import HTTP_RESPONSE_BYTES
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
+
+def accepted_codings(accept_encoding: Optional[str]) -> Set[str]:
+    codings = set()
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            codings.add(coding.strip().lower())
+    return codings
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    codings = accepted_codings(accept_encoding)
+    if brotli is not None and "br" in codings:
+        return "br"
+    if "gzip" in codings or "*" in codings:
+        return "gzip"
+    return None
+
+def encoded_etag(etag: str, coding: str) -> str:
+    if not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{coding}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    tags = {tag.strip() for tag in (if_none_match or "").split(",")}
+    if "*" in tags:
+        return True
+    return etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in tags}
+
+def gzip_bytes(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=settings.GZIP_LEVEL, mtime=0)
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=settings.BROTLI_QUALITY)
+    return gzip_bytes(body)
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        coding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        start_message = None
+        sent_encoding = "identity"
+        
+        async def send_compressed(message):
+            nonlocal start_message, sent_encoding
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                if message["type"] == "http.response.body":
+                    HTTP_RESPONSE_BYTES.inc(len(message.get("body", b"")), encoding=sent_encoding)
+                await send(message)
+                return
+            
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start.setdefault("headers", []))
+            content_type = headers.get("content-type", "")
+            eligible = (
+                not message.get("more_body", False)
+                and len(body) >= self.minimum_size
+                and "content-encoding" not in headers
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            if eligible and "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+            if eligible and coding is not None:
+                body = compress(body, coding)
+                headers["Content-Encoding"] = coding
+                if "etag" in headers:
+                    headers["ETag"] = encoded_etag(headers["etag"], coding)
+                headers["Content-Length"] = str(len(body))
+                message = {"type": "http.response.body", "body": body}
+            
+            sent_encoding = headers.get("content-encoding", "identity")
+            HTTP_RESPONSE_BYTES.inc(len(body), encoding=sent_encoding)
+            await send(start)
+            await send(message)
+        
+        await self.app(scope, receive, send_compressed)
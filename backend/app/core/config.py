@@ -3,9 +3,79 @@ from typing import List
 
 class Settings(BaseSettings):
     DATABASE_URL: str
-    GOOGLE_API_KEY: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    SQLITE_JOURNAL_MODE: str = "wal"
+    SQLITE_SYNCHRONOUS: str = "normal"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_KB: int = 16384
+    GOOGLE_API_KEY: str = ""
     ENVIRONMENT: str = "development"
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:3000,https://ai-wiki-quiz-generator-xi.vercel.app"
+    LLM_MODE: str = "parallel"
+    LLM_PROVIDER: str = "gemini"
+    CLIENT_WARMUP: str = "background"
+    MIGRATE_ON_STARTUP: bool = True
+    LLM_REQUESTS_PER_MINUTE: float = 60.0
+    LLM_TOKENS_PER_MINUTE: float = 1000000.0
+    LLM_RESERVED_OUTPUT_TOKENS: int = 2000
+    LLM_INITIAL_CONCURRENCY: int = 4
+    LLM_MIN_CONCURRENCY: int = 1
+    LLM_MAX_CONCURRENCY: int = 16
+    LLM_TARGET_LATENCY_SECONDS: float = 45.0
+    LLM_MAX_RETRIES: int = 4
+    LLM_BACKOFF_BASE_SECONDS: float = 1.0
+    LLM_BACKOFF_MAX_SECONDS: float = 20.0
+    LLM_TOPUP_MAX_CALLS: int = 1
+    DEFAULT_QUIZ_SIZE: int = 8
+    MAX_QUIZ_SIZE: int = 30
+    QUESTION_POOL_SIZE: int = 20
+    QUESTION_POOL_MAX_SIZE: int = 60
+    QUESTION_DEDUP_SCOPE: str = "global"
+    QUESTION_DEDUP_THRESHOLD: float = 0.5
+    STUB_LLM_RECORDING: str = "../sample_data/sample_output_alan_turing.json"
+    STUB_LLM_LATENCY_SECONDS: float = 1.5
+    STUB_LLM_JITTER_SECONDS: float = 0.5
+    STUB_LLM_SEED: int = 0
+    STUB_LLM_RATE_LIMIT_PROBABILITY: float = 0.0
+    SCRAPE_TIMEOUT_SECONDS: float = 20.0
+    QUIZ_TIMEOUT_SECONDS: float = 90.0
+    TOPICS_TIMEOUT_SECONDS: float = 30.0
+    GENERATION_CLAIM_TTL_SECONDS: float = 180.0
+    GENERATION_POLL_SECONDS: float = 1.0
+    VALIDATION_MODE: str = "full"
+    PAYLOAD_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    PAYLOAD_CACHE_REVALIDATE_SECONDS: float = 5.0
+    COMPRESSION_MIN_BYTES: int = 1024
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 5
+    BATCH_SCRAPE_CONCURRENCY: int = 4
+    BATCH_LLM_CONCURRENCY: int = 2
+    BATCH_MAX_URLS: int = 1000
+    BATCH_MAX_CONCURRENCY: int = 32
+    JOB_RETENTION_SECONDS: float = 600.0
+    SSE_KEEPALIVE_SECONDS: float = 15.0
+    HISTORY_PAGE_SIZE: int = 20
+    HISTORY_MAX_PAGE_SIZE: int = 100
+    SEARCH_PAGE_SIZE: int = 20
+    SEARCH_MAX_OFFSET: int = 1000
+    ARTICLE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    ARTICLE_CACHE_MAX_ENTRIES: int = 256
+    ARTICLE_CACHE_TTL_SECONDS: float = 900.0
+    CONTENT_TOKEN_BUDGET: int = 3000
+    TOPICS_TOKEN_BUDGET: int = 750
+    MAP_REDUCE_THRESHOLD_TOKENS: int = 6000
+    MAP_REDUCE_MAX_SHARDS: int = 4
+    SHARD_TOKEN_BUDGET: int = 2000
+    TRACE_REQUESTS: bool = False
+    WIKIPEDIA_DUMP_PATH: str = ""
+    WIKIPEDIA_DUMP_INDEX_PATH: str = ""
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
     
     @property
     def cors_origins_list(self) -> List[str]:
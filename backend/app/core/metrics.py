@@ -0,0 +1,194 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+class Metric:
+    kind = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        registry.register(self)
+    
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+    
+    def _format_labels(self, key: Tuple[str, ...]) -> str:
+        if not key:
+            return ""
+        pairs = ",".join(f'{name}="{value}"' for name, value in zip(self.labelnames, key))
+        return "{" + pairs + "}"
+    
+    def samples(self) -> List[str]:
+        return []
+    
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+class Counter(Metric):
+    kind = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+    
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+    
+    def total(self, **labels) -> float:
+        return sum(
+            value for key, value in self._values.items()
+            if all(key[self.labelnames.index(name)] == str(wanted) for name, wanted in labels.items())
+        )
+    
+    def samples(self) -> List[str]:
+        return [f"{self.name}{self._format_labels(key)} {value:g}" for key, value in self._values.items()]
+
+class Histogram(Metric):
+    kind = "histogram"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        counts = self._values.get(key)
+        if counts is None:
+            counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+    
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+    
+    def count(self, **labels) -> int:
+        counts = self._values.get(self._key(labels))
+        return sum(counts[:-1]) if counts else 0
+    
+    def samples(self) -> List[str]:
+        lines = []
+        for key, counts in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                labels = self._format_labels(key)
+                labels = labels[:-1] + f',le="{le}"}}' if labels else f'{{le="{le}"}}'
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {counts[-1]:g}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {cumulative}")
+        return lines
+
+class Gauge(Metric):
+    kind = "gauge"
+    
+    def __init__(self, name: str, documentation: str, function: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.function = function
+    
+    def samples(self) -> List[str]:
+        return [f"{self.name} {self.function():g}"]
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+    
+    def register(self, metric: Metric):
+        self._metrics.append(metric)
+    
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+registry = Registry()
+
+QUIZ_CACHE_LOOKUPS = Counter(
+    "quiz_cache_lookups_total",
+    "Quiz cache lookups by article key, by endpoint and result (hit, miss)",
+    ("endpoint", "result")
+)
+
+QUIZ_REDIRECT_HITS = Counter(
+    "quiz_redirect_hits_total",
+    "Cache misses resolved to an existing quiz after following a Wikipedia redirect"
+)
+
+QUIZ_REFRESHES = Counter(
+    "quiz_refreshes_total",
+    "Quiz refresh checks by result (not_modified, unchanged, updated)",
+    ("result",)
+)
+
+QUIZ_REFRESHED_QUESTIONS = Counter(
+    "quiz_refreshed_questions_total",
+    "Questions regenerated because the article section they reference changed"
+)
+
+QUIZ_VARIANTS = Counter(
+    "quiz_variants_total",
+    "Sized, mixed or seeded quiz variants by how they were served (pool, topped_up, short)",
+    ("result",)
+)
+
+QUESTION_POOL_TOPUPS = Counter(
+    "question_pool_topup_questions_total",
+    "Questions added to an article's pool because a requested variant ran out"
+)
+
+QUESTIONS_DEDUPLICATED = Counter(
+    "questions_deduplicated_total",
+    "Generated questions dropped as near-duplicates, by what they matched (batch, quiz, other_quiz)",
+    ("scope",)
+)
+
+def _cache_hit_ratio() -> float:
+    lookups = QUIZ_CACHE_LOOKUPS.total()
+    if not lookups:
+        return 0.0
+    return QUIZ_CACHE_LOOKUPS.total(result="hit") / lookups
+
+QUIZ_CACHE_HIT_RATIO = Gauge(
+    "quiz_cache_hit_ratio",
+    "Share of quiz cache lookups served from a stored quiz",
+    _cache_hit_ratio
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and status code",
+    ("method", "route", "status")
+)
+
+HTTP_RESPONSE_BYTES = Counter(
+    "http_response_bytes_total",
+    "Response body bytes sent by content encoding (identity, gzip, br)",
+    ("encoding",)
+)
+
+STAGE_DURATION = Histogram(
+    "pipeline_stage_duration_seconds",
+    "Latency of each timed pipeline stage (fetch, parse, llm_quiz, db_commit, ...)",
+    ("pipeline", "stage")
+)
+
+DB_QUERIES = Counter(
+    "db_queries_total",
+    "SQL statements executed by statement type",
+    ("operation",)
+)
@@ -0,0 +1,202 @@
+from typing import Callable, Dict, List, Tuple
+from sqlalchemy import JSON, column, inspect, text
+from sqlalchemy.engine import Connection
+
+def _add_article_key(conn: Connection):
+    from app.services.scraper import WikipediaScraper
+    
+    columns = {column['name'] for column in inspect(conn).get_columns('quizzes')}
+    if 'article_key' not in columns:
+        conn.execute(text("ALTER TABLE quizzes ADD COLUMN article_key VARCHAR"))
+    
+    taken = set(conn.execute(text("SELECT article_key FROM quizzes WHERE article_key IS NOT NULL")).scalars())
+    rows = conn.execute(text("SELECT id, url FROM quizzes WHERE article_key IS NULL ORDER BY id")).all()
+    for quiz_id, url in rows:
+        key = WikipediaScraper.article_key(url)
+        if key and key not in taken:
+            taken.add(key)
+            conn.execute(text("UPDATE quizzes SET article_key = :key WHERE id = :id"), {"key": key, "id": quiz_id})
+    
+    indexes = {index['name'] for index in inspect(conn).get_indexes('quizzes')}
+    if 'ix_quizzes_article_key' not in indexes:
+        conn.execute(text("CREATE UNIQUE INDEX ix_quizzes_article_key ON quizzes (article_key)"))
+
+def _move_raw_html_to_blobs(conn: Connection):
+    from app.services.blob_store import pack_html
+    
+    columns = {column['name'] for column in inspect(conn).get_columns('quizzes')}
+    if 'raw_html_sha256' not in columns:
+        conn.execute(text("ALTER TABLE quizzes ADD COLUMN raw_html_sha256 VARCHAR(64) REFERENCES article_blobs (sha256)"))
+    if 'raw_html' not in columns:
+        return
+    
+    while True:
+        rows = conn.execute(text(
+            "SELECT id, raw_html FROM quizzes WHERE raw_html IS NOT NULL ORDER BY id LIMIT 100"
+        )).all()
+        if not rows:
+            break
+        for quiz_id, raw_html in rows:
+            blob = pack_html(raw_html.encode('utf-8'))
+            exists = conn.execute(
+                text("SELECT 1 FROM article_blobs WHERE sha256 = :sha256"), {"sha256": blob['sha256']}
+            ).first()
+            if not exists:
+                conn.execute(
+                    text("INSERT INTO article_blobs (sha256, encoding, size, data) VALUES (:sha256, 'zlib', :size, :data)"),
+                    blob
+                )
+            conn.execute(
+                text("UPDATE quizzes SET raw_html_sha256 = :sha256, raw_html = NULL WHERE id = :id"),
+                {"sha256": blob['sha256'], "id": quiz_id}
+            )
+    
+    conn.execute(text("ALTER TABLE quizzes DROP COLUMN raw_html"))
+
+def _add_history_indexes(conn: Connection):
+    quiz_indexes = {index['name'] for index in inspect(conn).get_indexes('quizzes')}
+    if 'ix_quizzes_created_at_id' not in quiz_indexes:
+        conn.execute(text("CREATE INDEX ix_quizzes_created_at_id ON quizzes (created_at, id)"))
+    
+    question_indexes = {index['name'] for index in inspect(conn).get_indexes('questions')}
+    if 'ix_questions_quiz_id' not in question_indexes:
+        conn.execute(text("CREATE INDEX ix_questions_quiz_id ON questions (quiz_id)"))
+
+def _add_batch_job_source(conn: Connection):
+    columns = {column['name'] for column in inspect(conn).get_columns('batch_jobs')}
+    if 'source' not in columns:
+        conn.execute(text("ALTER TABLE batch_jobs ADD COLUMN source VARCHAR NOT NULL DEFAULT 'web'"))
+
+def _add_revision_tracking(conn: Connection):
+    columns = {column['name'] for column in inspect(conn).get_columns('quizzes')}
+    added = [
+        ('revision_id', 'VARCHAR'),
+        ('etag', 'VARCHAR'),
+        ('last_modified', 'VARCHAR'),
+        ('section_hashes', 'JSON'),
+        ('checked_at', 'TIMESTAMP WITH TIME ZONE'),
+    ]
+    for name, column_type in added:
+        if name not in columns:
+            conn.execute(text(f"ALTER TABLE quizzes ADD COLUMN {name} {column_type}"))
+
+def _index_question_bank(conn: Connection):
+    from app.services.question_index import fingerprint, pack_signature
+    
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            "SELECT q.id, q.quiz_id, q.question_text, q.correct_answer FROM questions q "
+            "LEFT JOIN question_signatures s ON s.question_id = q.id "
+            "WHERE q.id > :last_id AND s.question_id IS NULL ORDER BY q.id LIMIT 500"
+        ), {"last_id": last_id}).all()
+        if not rows:
+            break
+        signatures = []
+        bands = []
+        for question_id, quiz_id, question_text, answer in rows:
+            fp = fingerprint(question_text, answer)
+            signatures.append({"question_id": question_id, "quiz_id": quiz_id, "signature": pack_signature(fp.signature)})
+            bands.extend({"bucket": bucket, "question_id": question_id} for bucket in fp.buckets)
+        conn.execute(text(
+            "INSERT INTO question_signatures (question_id, quiz_id, signature) VALUES (:question_id, :quiz_id, :signature)"
+        ), signatures)
+        conn.execute(text("INSERT INTO question_bands (bucket, question_id) VALUES (:bucket, :question_id)"), bands)
+        last_id = rows[-1][0]
+
+def _add_search_index(conn: Connection):
+    from app.services.search_index import create_search_index, search_document, write_documents
+    
+    create_search_index(conn)
+    last_id = 0
+    while True:
+        quizzes = conn.execute(
+            text("SELECT id, title, summary, key_entities, sections FROM quizzes WHERE id > :last_id ORDER BY id LIMIT 200")
+            .columns(column("id"), column("title"), column("summary"), column("key_entities", JSON), column("sections", JSON)),
+            {"last_id": last_id}
+        ).all()
+        if not quizzes:
+            break
+        question_texts: Dict[int, List[str]] = {}
+        rows = conn.execute(text(
+            "SELECT quiz_id, question_text FROM questions WHERE quiz_id BETWEEN :first AND :last ORDER BY id"
+        ), {"first": quizzes[0].id, "last": quizzes[-1].id})
+        for quiz_id, question_text in rows:
+            question_texts.setdefault(quiz_id, []).append(question_text)
+        write_documents(conn, [search_document(quiz, question_texts.get(quiz.id, [])) for quiz in quizzes])
+        last_id = quizzes[-1].id
+
+def _add_compressed_payloads(conn: Connection):
+    from app.core.compression import gzip_bytes
+    from app.core.config import settings
+    
+    columns = {column['name'] for column in inspect(conn).get_columns('quiz_payloads')}
+    if 'gzip_body' not in columns:
+        binary = "BYTEA" if conn.dialect.name == "postgresql" else "BLOB"
+        conn.execute(text(f"ALTER TABLE quiz_payloads ADD COLUMN gzip_body {binary}"))
+    
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            "SELECT quiz_id, body FROM quiz_payloads WHERE quiz_id > :last_id AND gzip_body IS NULL ORDER BY quiz_id LIMIT 200"
+        ), {"last_id": last_id}).all()
+        if not rows:
+            break
+        updates = [
+            {"quiz_id": quiz_id, "gzip_body": gzip_bytes(body)}
+            for quiz_id, body in rows
+            if len(body) >= settings.COMPRESSION_MIN_BYTES
+        ]
+        if updates:
+            conn.execute(text("UPDATE quiz_payloads SET gzip_body = :gzip_body WHERE quiz_id = :quiz_id"), updates)
+        last_id = rows[-1][0]
+
+def _add_exhausted_difficulties(conn: Connection):
+    columns = {column['name'] for column in inspect(conn).get_columns('quizzes')}
+    if 'exhausted_difficulties' not in columns:
+        conn.execute(text("ALTER TABLE quizzes ADD COLUMN exhausted_difficulties JSON"))
+
+def _add_batch_job_error(conn: Connection):
+    columns = {column['name'] for column in inspect(conn).get_columns('batch_jobs')}
+    if 'error' not in columns:
+        conn.execute(text("ALTER TABLE batch_jobs ADD COLUMN error TEXT"))
+
+def _rebuild_question_bands(conn: Connection):
+    from app.services.question_index import band_buckets, unpack_signature
+    
+    conn.execute(text("DELETE FROM question_bands"))
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            "SELECT question_id, signature FROM question_signatures WHERE question_id > :last_id ORDER BY question_id LIMIT 500"
+        ), {"last_id": last_id}).all()
+        if not rows:
+            break
+        conn.execute(text("INSERT INTO question_bands (bucket, question_id) VALUES (:bucket, :question_id)"), [
+            {"bucket": bucket, "question_id": question_id}
+            for question_id, signature in rows
+            for bucket in band_buckets(unpack_signature(signature))
+        ])
+        last_id = rows[-1][0]
+
+MIGRATIONS: List[Tuple[int, Callable[[Connection], None]]] = [
+    (1, _add_article_key),
+    (2, _move_raw_html_to_blobs),
+    (3, _add_history_indexes),
+    (4, _add_batch_job_source),
+    (5, _add_revision_tracking),
+    (6, _index_question_bank),
+    (7, _add_search_index),
+    (8, _add_compressed_payloads),
+    (9, _add_exhausted_difficulties),
+    (10, _add_batch_job_error),
+    (11, _rebuild_question_bands),
+]
+
+def run_migrations(conn: Connection):
+    conn.execute(text("CREATE TABLE IF NOT EXISTS schema_migrations (version INTEGER PRIMARY KEY)"))
+    applied = set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+    for version, migration in MIGRATIONS:
+        if version not in applied:
+            migration(conn)
+            conn.execute(text("INSERT INTO schema_migrations (version) VALUES (:version)"), {"version": version})
@@ -0,0 +1,45 @@
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, List, TypeVar
+from app.core.metrics import STAGE_DURATION
+from app.core.tracing import current_trace
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+listeners: List[Callable[["StageTimer"], None]] = []
+
+class StageTimer:
+    def __init__(self, name: str):
+        self.name = name
+        self.timings: Dict[str, float] = {}
+    
+    @contextmanager
+    def stage(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[stage] = elapsed
+            STAGE_DURATION.observe(elapsed, pipeline=self.name, stage=stage)
+            trace = current_trace.get()
+            if trace is not None:
+                trace.add(stage, start, elapsed)
+    
+    async def run(self, stage: str, awaitable: Awaitable[T], timeout: float) -> T:
+        with self.stage(stage):
+            try:
+                return await asyncio.wait_for(awaitable, timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"{stage} exceeded its {timeout:g}s budget")
+    
+    def log(self, **context):
+        details = " ".join(f"{key}={value}" for key, value in context.items())
+        stages = " ".join(f"{stage}={seconds * 1000:.0f}ms" for stage, seconds in self.timings.items())
+        logger.info("%s %s %s", self.name, details, stages)
+        for listener in listeners:
+            listener(self)
@@ -0,0 +1,52 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import HTTP_REQUEST_DURATION
+
+logger = logging.getLogger(__name__)
+
+class Trace:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans: List[Tuple[str, float, float]] = []
+    
+    def add(self, name: str, start: float, duration: float):
+        self.spans.append((name, start - self.start, duration))
+    
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={duration * 1000:.1f}" for name, _, duration in self.spans)
+
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+class RequestTimingMiddleware:
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        trace = Trace() if settings.TRACE_REQUESTS else None
+        token = current_trace.set(trace)
+        start = time.perf_counter()
+        status = 500
+        
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if trace is not None and trace.spans:
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", trace.server_timing().encode())]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_trace.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, method=scope["method"], route=route, status=status)
+            if trace is not None and trace.spans:
+                logger.info("trace %s %s %s", scope["method"], route, trace.server_timing())
@@ -1,15 +1,42 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.clients import clients
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine, init_db
+from app.core.metrics import registry
+from app.core.tracing import RequestTimingMiddleware
 from app.api.routes import router
 
-Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
+
+async def warm_clients():
+    try:
+        await asyncio.to_thread(clients.warm)
+    except Exception as e:
+        logger.warning("Client warm-up failed, it will be retried on first use: %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.MIGRATE_ON_STARTUP:
+        await init_db()
+    clients.startup()
+    warmup = asyncio.create_task(warm_clients()) if settings.CLIENT_WARMUP == "background" else None
+    yield
+    if warmup is not None:
+        await warmup
+    await clients.aclose()
+    await engine.dispose()
 
 app = FastAPI(
     title="Wiki Quiz Generator API",
     description="Generate quizzes from Wikipedia articles using AI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -20,6 +47,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_BYTES)
+
+app.add_middleware(RequestTimingMiddleware)
+
 app.include_router(router)
 
 @app.get("/")
@@ -33,3 +64,7 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return registry.render()
@@ -0,0 +1,10 @@
+import asyncio
+from app.core.database import engine, init_db
+
+async def main():
+    await init_db()
+    await engine.dispose()
+    print("Database schema is up to date")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, ForeignKey
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime, JSON, ForeignKey, Float, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -8,22 +8,33 @@ class Quiz(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     url = Column(String, unique=True, index=True, nullable=False)
+    article_key = Column(String, unique=True, index=True)
     title = Column(String, nullable=False)
     summary = Column(Text)
     key_entities = Column(JSON)
     sections = Column(JSON)
     related_topics = Column(JSON)
-    raw_html = Column(Text)
+    raw_html_sha256 = Column(String(64), ForeignKey("article_blobs.sha256"))
+    revision_id = Column(String)
+    etag = Column(String)
+    last_modified = Column(String)
+    section_hashes = Column(JSON)
+    exhausted_difficulties = Column(JSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    checked_at = Column(DateTime(timezone=True))
     
     questions = relationship("Question", back_populates="quiz", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("ix_quizzes_created_at_id", "created_at", "id"),
+    )
 
 class Question(Base):
     __tablename__ = "questions"
     
     id = Column(Integer, primary_key=True, index=True)
-    quiz_id = Column(Integer, ForeignKey("quizzes.id"), nullable=False)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id"), nullable=False, index=True)
     question_text = Column(Text, nullable=False)
     options = Column(JSON, nullable=False)
     correct_answer = Column(String, nullable=False)
@@ -32,3 +43,77 @@ class Question(Base):
     section_reference = Column(String)
     
     quiz = relationship("Quiz", back_populates="questions")
+
+class QuestionSignature(Base):
+    __tablename__ = "question_signatures"
+    
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False, index=True)
+    signature = Column(LargeBinary, nullable=False)
+
+class QuestionBand(Base):
+    __tablename__ = "question_bands"
+    
+    bucket = Column(BigInteger, primary_key=True)
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+class QuizPayload(Base):
+    __tablename__ = "quiz_payloads"
+    
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True)
+    etag = Column(String, nullable=False)
+    body = Column(LargeBinary, nullable=False)
+    gzip_body = Column(LargeBinary)
+
+class ArticleBlob(Base):
+    __tablename__ = "article_blobs"
+    
+    sha256 = Column(String(64), primary_key=True)
+    encoding = Column(String, nullable=False, default="zlib")
+    size = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+
+class ArticleAlias(Base):
+    __tablename__ = "article_aliases"
+    
+    alias_key = Column(String, primary_key=True)
+    article_key = Column(String, nullable=False)
+
+class GenerationClaim(Base):
+    __tablename__ = "generation_claims"
+    
+    key = Column(String, primary_key=True)
+    owner = Column(String, nullable=False)
+    expires_at = Column(Float, nullable=False)
+
+class BatchJob(Base):
+    __tablename__ = "batch_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, nullable=False, default="pending")
+    scrape_concurrency = Column(Integer, nullable=False)
+    llm_concurrency = Column(Integer, nullable=False)
+    source = Column(String, nullable=False, default="web", server_default="web")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(Float)
+    finished_at = Column(Float)
+    error = Column(Text)
+    
+    items = relationship("BatchJobItem", back_populates="job", cascade="all, delete-orphan", order_by="BatchJobItem.id")
+
+class BatchJobItem(Base):
+    __tablename__ = "batch_job_items"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("batch_jobs.id"), nullable=False)
+    url = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending")
+    quiz_id = Column(Integer, ForeignKey("quizzes.id"))
+    error = Column(Text)
+    duration = Column(Float)
+    
+    job = relationship("BatchJob", back_populates="items")
+    
+    __table_args__ = (
+        Index("ix_batch_job_items_job_id_status", "job_id", "status"),
+    )
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, HttpUrl
-from typing import List, Dict, Optional
+from pydantic import BaseModel, Field, HttpUrl
+from typing import List, Dict, Literal, Optional
 from datetime import datetime
+from app.core.config import settings
 
 class QuestionBase(BaseModel):
     question: str
@@ -39,6 +40,7 @@ class QuizResponse(QuizBase):
     id: int
     quiz: List[QuestionResponse]
     created_at: datetime
+    seed: Optional[int] = None
     
     class Config:
         from_attributes = True
@@ -49,12 +51,40 @@ class QuizHistoryItem(BaseModel):
     title: str
     created_at: datetime
     question_count: int
+    pool_size: int
     
     class Config:
         from_attributes = True
 
+class QuizHistoryPage(BaseModel):
+    items: List[QuizHistoryItem]
+    next_cursor: Optional[int] = None
+
+class QuizSearchItem(QuizHistoryItem):
+    score: float
+
+class QuizSearchPage(BaseModel):
+    items: List[QuizSearchItem]
+    next_offset: Optional[int] = None
+
+class QuizRefreshResponse(BaseModel):
+    quiz_id: int
+    status: str
+    revision_id: Optional[str] = None
+    changed_sections: List[str] = []
+    removed_sections: List[str] = []
+    questions_replaced: int = 0
+    error: Optional[str] = None
+
 class URLValidationRequest(BaseModel):
     url: str
+    source: Literal["web", "dump"] = "web"
+
+class QuizGenerateRequest(URLValidationRequest):
+    num_questions: Optional[int] = Field(None, ge=1)
+    difficulty_mix: Optional[Dict[Literal["easy", "medium", "hard"], float]] = None
+    shuffle: bool = False
+    seed: Optional[int] = None
 
 class URLValidationResponse(BaseModel):
     valid: bool
@@ -62,3 +92,39 @@ class URLValidationResponse(BaseModel):
     message: Optional[str] = None
     cached: bool = False
     quiz_id: Optional[int] = None
+
+class BatchJobRequest(BaseModel):
+    urls: List[str]
+    scrape_concurrency: Optional[int] = Field(None, ge=1, le=settings.BATCH_MAX_CONCURRENCY)
+    llm_concurrency: Optional[int] = Field(None, ge=1, le=settings.BATCH_MAX_CONCURRENCY)
+    source: Literal["web", "dump"] = "web"
+
+class BatchJobItemResponse(BaseModel):
+    url: str
+    status: str
+    quiz_id: Optional[int] = None
+    error: Optional[str] = None
+    duration: Optional[float] = None
+    
+    class Config:
+        from_attributes = True
+
+class BatchJobResponse(BaseModel):
+    id: int
+    status: str
+    source: str = "web"
+    error: Optional[str] = None
+    total: int
+    done: int
+    failed: int
+    pending: int
+    elapsed_seconds: Optional[float] = None
+    quizzes_per_minute: Optional[float] = None
+    failures: List[BatchJobItemResponse] = []
+
+class GenerationJobResponse(BaseModel):
+    job_id: str
+    status: str
+    quiz_id: Optional[int] = None
+    error: Optional[str] = None
+    first_question_seconds: Optional[float] = None
@@ -0,0 +1,75 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import Counter
+
+ARTICLE_CACHE_LOOKUPS = Counter(
+    "article_cache_lookups_total",
+    "Parsed article cache lookups by result (hit, miss, expired)",
+    ("result",)
+)
+
+def article_size(value) -> int:
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(article_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(article_size(item) for item in value)
+    return 8
+
+class ArticleCache:
+    def __init__(self, max_bytes: int, max_entries: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.bytes = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, int, Dict]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, source: str, key: str) -> Optional[Dict]:
+        entry = self._entries.get((source, key))
+        if entry is None:
+            ARTICLE_CACHE_LOOKUPS.inc(result='miss')
+            return None
+        
+        expires_at, _, article = entry
+        if expires_at < time.monotonic():
+            self.discard(source, key)
+            ARTICLE_CACHE_LOOKUPS.inc(result='expired')
+            return None
+        
+        self._entries.move_to_end((source, key))
+        ARTICLE_CACHE_LOOKUPS.inc(result='hit')
+        return article
+    
+    def put(self, source: str, key: str, article: Dict):
+        size = article_size(article)
+        if size > self.max_bytes:
+            return
+        
+        self.discard(source, key)
+        self._entries[source, key] = (time.monotonic() + self.ttl_seconds, size, article)
+        self.bytes += size
+        
+        while self.bytes > self.max_bytes or len(self._entries) > self.max_entries:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+    
+    def discard(self, source: str, key: str):
+        entry = self._entries.pop((source, key), None)
+        if entry is not None:
+            self.bytes -= entry[1]
+    
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+article_cache = ArticleCache(
+    max_bytes=settings.ARTICLE_CACHE_MAX_BYTES,
+    max_entries=settings.ARTICLE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ARTICLE_CACHE_TTL_SECONDS
+)
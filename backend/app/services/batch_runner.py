@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.quiz import BatchJob, BatchJobItem
+from app.schemas.quiz import BatchJobItemResponse, BatchJobResponse, QuizRefreshResponse
+from app.services.llm_scheduler import BATCH
+from app.services.quiz_service import QuizService
+
+logger = logging.getLogger(__name__)
+
+URL_PATTERN = re.compile(r'https?://\S+')
+
+running_jobs: Dict[int, asyncio.Task] = {}
+
+def is_running(job_id: int) -> bool:
+    task = running_jobs.get(job_id)
+    return task is not None and not task.done()
+
+def parse_url_list(text: str) -> List[str]:
+    urls = []
+    seen = set()
+    for url in URL_PATTERN.findall(text):
+        if url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+class BatchRunner:
+    def __init__(self, scrape_concurrency: Optional[int] = None, llm_concurrency: Optional[int] = None, source: str = 'web'):
+        self.scrape_concurrency = scrape_concurrency
+        self.llm_concurrency = llm_concurrency
+        self.source = source
+    
+    async def create_job(self, db: AsyncSession, urls: List[str]) -> BatchJob:
+        if not urls:
+            raise ValueError("The URL list is empty.")
+        if len(urls) > settings.BATCH_MAX_URLS:
+            raise ValueError(f"A batch can contain at most {settings.BATCH_MAX_URLS} URLs.")
+        
+        job = BatchJob(
+            status="pending",
+            scrape_concurrency=self.scrape_concurrency or settings.BATCH_SCRAPE_CONCURRENCY,
+            llm_concurrency=self.llm_concurrency or settings.BATCH_LLM_CONCURRENCY,
+            source=self.source,
+            items=[BatchJobItem(url=url, status="pending") for url in urls]
+        )
+        db.add(job)
+        await db.commit()
+        return job
+    
+    def start(self, job_id: int, retry_failed: bool = False) -> asyncio.Task:
+        task = asyncio.create_task(self.run(job_id, retry_failed=retry_failed))
+        running_jobs[job_id] = task
+        task.add_done_callback(lambda _: running_jobs.pop(job_id) if running_jobs.get(job_id) is task else None)
+        return task
+    
+    async def run(self, job_id: int, retry_failed: bool = False):
+        pending, source, scrape_concurrency, llm_concurrency = await self._claim(job_id, retry_failed)
+        try:
+            await self._process(pending, source, scrape_concurrency, llm_concurrency)
+        except asyncio.CancelledError:
+            await self._finish(job_id, "interrupted", "The batch job was cancelled before it finished.")
+            raise
+        except Exception as e:
+            logger.exception("batch job %s failed", job_id)
+            await self._finish(job_id, "failed", str(e))
+        else:
+            await self._finish(job_id, "completed")
+    
+    async def _claim(self, job_id: int, retry_failed: bool) -> Tuple[list, str, int, int]:
+        resumable = ["running", "failed"] if retry_failed else ["running"]
+        async with AsyncSessionLocal() as db:
+            job = await db.get(BatchJob, job_id)
+            if job is None:
+                raise ValueError(f"Batch job {job_id} not found")
+            await db.execute(
+                update(BatchJobItem)
+                .where(BatchJobItem.job_id == job_id, BatchJobItem.status.in_(resumable))
+                .values(status="pending")
+            )
+            result = await db.execute(
+                select(BatchJobItem.id, BatchJobItem.url)
+                .where(BatchJobItem.job_id == job_id, BatchJobItem.status == "pending")
+                .order_by(BatchJobItem.id)
+            )
+            pending = result.all()
+            source = job.source
+            job.scrape_concurrency = self.scrape_concurrency or job.scrape_concurrency
+            job.llm_concurrency = self.llm_concurrency or job.llm_concurrency
+            scrape_concurrency, llm_concurrency = job.scrape_concurrency, job.llm_concurrency
+            job.status = "running"
+            job.started_at = job.started_at or time.time()
+            job.finished_at = None
+            job.error = None
+            await db.commit()
+        return pending, source, scrape_concurrency, llm_concurrency
+    
+    async def _process(self, pending: list, source: str, scrape_concurrency: int, llm_concurrency: int):
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in pending:
+            queue.put_nowait(item)
+        
+        scrape_limit = asyncio.Semaphore(scrape_concurrency)
+        llm_limit = asyncio.Semaphore(llm_concurrency)
+        workers = [
+            asyncio.create_task(self._worker(queue, scrape_limit, llm_limit, source))
+            for _ in range(min(len(pending), scrape_concurrency + llm_concurrency) or 1)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+    
+    async def _finish(self, job_id: int, status: str, error: Optional[str] = None):
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(BatchJob).where(BatchJob.id == job_id).values(status=status, error=error, finished_at=time.time())
+            )
+            await db.commit()
+    
+    async def _worker(self, queue: asyncio.Queue, scrape_limit: asyncio.Semaphore, llm_limit: asyncio.Semaphore, source: str):
+        while not queue.empty():
+            item_id, url = queue.get_nowait()
+            await self._set_item(item_id, status="running")
+            start = time.perf_counter()
+            try:
+                async with AsyncSessionLocal() as db:
+                    quiz = await QuizService(db, scrape_limit=scrape_limit, llm_limit=llm_limit, priority=BATCH, source=source).generate_quiz(url)
+                await self._set_item(item_id, status="done", quiz_id=quiz.id, error=None, duration=time.perf_counter() - start)
+            except Exception as e:
+                await self._set_item(item_id, status="failed", error=str(e), duration=time.perf_counter() - start)
+    
+    async def _set_item(self, item_id: int, **values):
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(BatchJobItem).where(BatchJobItem.id == item_id).values(**values))
+            await db.commit()
+
+async def get_job_status(db: AsyncSession, job_id: int) -> Optional[BatchJobResponse]:
+    result = await db.execute(
+        select(BatchJob).options(selectinload(BatchJob.items)).where(BatchJob.id == job_id)
+    )
+    job = result.scalars().first()
+    if job is None:
+        return None
+    
+    done = sum(1 for item in job.items if item.status == "done")
+    failed = [item for item in job.items if item.status == "failed"]
+    elapsed = None
+    per_minute = None
+    if job.started_at:
+        elapsed = (job.finished_at or time.time()) - job.started_at
+        per_minute = done / elapsed * 60 if elapsed > 0 else None
+    
+    return BatchJobResponse(
+        id=job.id,
+        status=job.status,
+        source=job.source,
+        error=job.error,
+        total=len(job.items),
+        done=done,
+        failed=len(failed),
+        pending=len(job.items) - done - len(failed),
+        elapsed_seconds=elapsed,
+        quizzes_per_minute=per_minute,
+        failures=[BatchJobItemResponse.model_validate(item) for item in failed]
+    )
+
+async def refresh_stale_quizzes(
+    max_age_seconds: float,
+    limit: int,
+    scrape_concurrency: Optional[int] = None,
+    llm_concurrency: Optional[int] = None,
+    source: str = 'web'
+) -> List[QuizRefreshResponse]:
+    async with AsyncSessionLocal() as db:
+        quiz_ids = await QuizService(db).stale_quiz_ids(max_age_seconds, limit)
+    
+    scrape_limit = asyncio.Semaphore(scrape_concurrency or settings.BATCH_SCRAPE_CONCURRENCY)
+    llm_limit = asyncio.Semaphore(llm_concurrency or settings.BATCH_LLM_CONCURRENCY)
+    
+    async def refresh(quiz_id: int) -> QuizRefreshResponse:
+        try:
+            async with AsyncSessionLocal() as db:
+                service = QuizService(db, scrape_limit=scrape_limit, llm_limit=llm_limit, priority=BATCH, source=source)
+                return await service.refresh_quiz(quiz_id) or QuizRefreshResponse(quiz_id=quiz_id, status='missing')
+        except Exception as e:
+            return QuizRefreshResponse(quiz_id=quiz_id, status='failed', error=str(e))
+    
+    return list(await asyncio.gather(*(refresh(quiz_id) for quiz_id in quiz_ids)))
@@ -0,0 +1,44 @@
+import hashlib
+import zlib
+from typing import Dict, Optional
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.quiz import ArticleBlob, Quiz
+
+COMPRESSION_LEVEL = 6
+
+def pack_html(raw: bytes) -> Dict:
+    return {
+        'sha256': hashlib.sha256(raw).hexdigest(),
+        'size': len(raw),
+        'data': zlib.compress(raw, COMPRESSION_LEVEL)
+    }
+
+def unpack_html(data: bytes) -> str:
+    return zlib.decompress(data).decode('utf-8', errors='replace')
+
+async def store_blob(db: AsyncSession, blob: Dict) -> str:
+    values = {'sha256': blob['sha256'], 'encoding': 'zlib', 'size': blob['size'], 'data': blob['data']}
+    if db.get_bind().dialect.name == 'postgresql':
+        statement = postgresql_insert(ArticleBlob).values(**values).on_conflict_do_nothing()
+    elif db.get_bind().dialect.name == 'sqlite':
+        statement = sqlite_insert(ArticleBlob).values(**values).on_conflict_do_nothing()
+    else:
+        if await db.get(ArticleBlob, blob['sha256']) is None:
+            db.add(ArticleBlob(**values))
+        return blob['sha256']
+    await db.execute(statement)
+    return blob['sha256']
+
+async def discard_blob(db: AsyncSession, sha256: str):
+    referenced = select(Quiz.id).where(Quiz.raw_html_sha256 == sha256).exists()
+    await db.execute(delete(ArticleBlob).where(ArticleBlob.sha256 == sha256, ~referenced))
+
+async def load_html(db: AsyncSession, sha256: str) -> Optional[str]:
+    result = await db.execute(select(ArticleBlob.data).where(ArticleBlob.sha256 == sha256))
+    data = result.scalar()
+    if data is None:
+        return None
+    return unpack_html(data)
@@ -0,0 +1,126 @@
+import hashlib
+import re
+from typing import Dict, List, NamedTuple
+
+SECTION_PATTERN = re.compile(r'^## (.+)$', re.MULTILINE)
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?])\s+')
+LEAD_SECTION = "Introduction"
+CHARS_PER_TOKEN = 4
+MIN_SECTION_TOKENS = 40
+
+class Section(NamedTuple):
+    name: str
+    paragraphs: List[str]
+    tokens: int
+
+class Shard(NamedTuple):
+    sections: List[str]
+    content: str
+    num_questions: int
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def split_sections(content: str) -> List[Section]:
+    sections = []
+    names = [LEAD_SECTION] + SECTION_PATTERN.findall(content)
+    for name, body in zip(names, SECTION_PATTERN.split(content)[::2]):
+        paragraphs = [p.strip() for p in body.split('\n\n') if p.strip()]
+        if paragraphs:
+            sections.append(Section(name.strip(), paragraphs, sum(estimate_tokens(p) for p in paragraphs)))
+    return sections
+
+def section_keys(sections: List[Section]) -> List[str]:
+    seen: Dict[str, int] = {}
+    keys = []
+    for section in sections:
+        seen[section.name] = seen.get(section.name, 0) + 1
+        keys.append(section.name if seen[section.name] == 1 else f"{section.name}#{seen[section.name]}")
+    return keys
+
+def section_name(key: str) -> str:
+    name, _, occurrence = key.rpartition('#')
+    return name if name and not name[-1].isspace() and occurrence.isdigit() else key
+
+def section_hashes(content: str) -> Dict[str, str]:
+    sections = split_sections(content)
+    return {
+        key: hashlib.sha256('\n\n'.join(section.paragraphs).encode('utf-8')).hexdigest()[:16]
+        for key, section in zip(section_keys(sections), sections)
+    }
+
+def compress_section(section: Section, budget: int) -> str:
+    remaining = budget * CHARS_PER_TOKEN
+    picked = []
+    for paragraph in section.paragraphs:
+        if len(paragraph) <= remaining:
+            picked.append(paragraph)
+            remaining -= len(paragraph) + 2
+            continue
+        sentences = []
+        for sentence in SENTENCE_END_PATTERN.split(paragraph):
+            if len(sentence) > remaining:
+                break
+            sentences.append(sentence)
+            remaining -= len(sentence) + 1
+        if sentences:
+            picked.append(' '.join(sentences))
+        break
+    return '\n\n'.join(picked)
+
+def allocate_budget(sections: List[Section], budget: int) -> List[int]:
+    allocation = [0] * len(sections)
+    pending = list(range(len(sections)))
+    while pending and budget > 0:
+        share = max(budget // len(pending), MIN_SECTION_TOKENS)
+        satisfied = [i for i in pending if sections[i].tokens <= share]
+        if not satisfied:
+            for i in pending:
+                allocation[i] = min(share, budget)
+                budget -= allocation[i]
+            break
+        for i in satisfied:
+            allocation[i] = sections[i].tokens
+            budget -= sections[i].tokens
+            pending.remove(i)
+    return allocation
+
+def render_sections(sections: List[Section], budget: int) -> str:
+    blocks = []
+    budget -= sum(estimate_tokens(f"## {section.name}\n\n\n\n") for section in sections)
+    for section, allowance in zip(sections, allocate_budget(sections, budget)):
+        text = compress_section(section, allowance)
+        if not text:
+            continue
+        blocks.append(text if section.name == LEAD_SECTION else f"## {section.name}\n\n{text}")
+    return '\n\n'.join(blocks)
+
+def plan_content(content: str, budget: int) -> str:
+    if estimate_tokens(content) <= budget:
+        return content
+    return render_sections(split_sections(content), budget)
+
+def plan_shards(content: str, num_questions: int, max_shards: int, shard_budget: int) -> List[Shard]:
+    sections = split_sections(content)
+    shard_count = max(1, min(max_shards, num_questions, len(sections)))
+    target = sum(s.tokens for s in sections) / shard_count
+
+    groups: List[List[Section]] = [[]]
+    filled = 0
+    for section in sections:
+        if groups[-1] and filled >= target and len(groups) < shard_count:
+            groups.append([])
+            filled = 0
+        groups[-1].append(section)
+        filled += section.tokens
+
+    totals = [sum(s.tokens for s in group) for group in groups]
+    counts = [1] * len(groups)
+    for _ in range(num_questions - len(groups)):
+        i = max(range(len(groups)), key=lambda i: totals[i] / (counts[i] + 1))
+        counts[i] += 1
+
+    return [
+        Shard([s.name for s in group], render_sections(group, shard_budget), count)
+        for group, count in zip(groups, counts)
+    ]
@@ -0,0 +1,202 @@
+import asyncio
+import bz2
+import html
+import mmap
+import os
+import re
+import sqlite3
+import threading
+import xml.etree.ElementTree as ElementTree
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.core.timing import StageTimer
+from app.services.blob_store import pack_html
+from app.services.scraper import WikipediaScraper
+from app.services.wikitext import convert_wikitext
+
+TITLE_PATTERN = re.compile(rb'<title>(.*?)</title>')
+READ_CHUNK_BYTES = 1024 * 1024
+STREAM_CACHE_SIZE = 4
+MAX_REDIRECTS = 2
+NAMESPACES = {
+    'User', 'Wikipedia', 'File', 'MediaWiki', 'Template', 'Help', 'Category', 'Portal', 'Draft',
+    'TimedText', 'Module', 'Special', 'Media', 'Gadget', 'Gadget definition', 'Event'
+}
+
+DUMP_READS = Counter(
+    "wikipedia_dump_reads_total",
+    "Offline dump article reads by result (hit, missing, redirect)",
+    ("result",)
+)
+
+def iter_streams(path: str) -> Iterator[Tuple[int, int, bytes]]:
+    with open(path, 'rb') as f:
+        offset = 0
+        decompressor = bz2.BZ2Decompressor()
+        output = []
+        pending = b''
+        while True:
+            data = pending or f.read(READ_CHUNK_BYTES)
+            pending = b''
+            if not data:
+                break
+            output.append(decompressor.decompress(data))
+            if decompressor.eof:
+                unused = decompressor.unused_data
+                end = f.tell() - len(unused)
+                yield offset, end - offset, b''.join(output)
+                offset = end
+                decompressor = bz2.BZ2Decompressor()
+                output = []
+                pending = unused
+
+def build_index(dump_path: str, index_path: str, multistream_index: Optional[str] = None) -> int:
+    db = sqlite3.connect(index_path)
+    db.execute("DROP TABLE IF EXISTS pages")
+    db.execute("CREATE TABLE pages (key TEXT PRIMARY KEY, offset INTEGER NOT NULL, length INTEGER NOT NULL) WITHOUT ROWID")
+    rows = _rows_from_index(dump_path, multistream_index) if multistream_index else _rows_from_scan(dump_path)
+    count = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= 10000:
+            db.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", batch)
+            count += len(batch)
+            batch = []
+    db.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", batch)
+    count += len(batch)
+    db.commit()
+    db.close()
+    return count
+
+def is_article_title(title: str) -> bool:
+    namespace, colon, _ = title.partition(':')
+    if not colon:
+        return True
+    if namespace.endswith(' talk'):
+        namespace = namespace[:-len(' talk')]
+    return namespace != 'Talk' and namespace not in NAMESPACES
+
+def _article_key(title: str) -> Optional[str]:
+    return WikipediaScraper.normalize_title(title) if is_article_title(title) else None
+
+def _rows_from_scan(dump_path: str) -> Iterator[Tuple[str, int, int]]:
+    for offset, length, text in iter_streams(dump_path):
+        for match in TITLE_PATTERN.finditer(text):
+            key = _article_key(html.unescape(match.group(1).decode('utf-8')))
+            if key:
+                yield key, offset, length
+
+def _rows_from_index(dump_path: str, multistream_index: str) -> Iterator[Tuple[str, int, int]]:
+    opener = bz2.open if multistream_index.endswith('.bz2') else open
+    with opener(multistream_index, 'rt', encoding='utf-8') as f:
+        stream_offset = None
+        keys = []
+        for line in f:
+            offset, _, title = line.rstrip('\n').split(':', 2)
+            offset = int(offset)
+            if offset != stream_offset:
+                for key in keys:
+                    yield key, stream_offset, offset - stream_offset
+                stream_offset = offset
+                keys = []
+            key = _article_key(title)
+            if key:
+                keys.append(key)
+    size = os.path.getsize(dump_path)
+    for key in keys:
+        yield key, stream_offset, size - stream_offset
+
+class DumpSource:
+    def __init__(self, dump_path: str, index_path: str):
+        self._file = open(dump_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._streams: "OrderedDict[int, bytes]" = OrderedDict()
+    
+    def lookup(self, key: str) -> Optional[Tuple[int, int]]:
+        with self._lock:
+            return self._index.execute("SELECT offset, length FROM pages WHERE key = ?", (key,)).fetchone()
+    
+    def read_stream(self, offset: int, length: int) -> bytes:
+        with self._lock:
+            text = self._streams.get(offset)
+            if text is not None:
+                self._streams.move_to_end(offset)
+                return text
+        text = bz2.decompress(self._map[offset:offset + length])
+        with self._lock:
+            self._streams[offset] = text
+            while len(self._streams) > STREAM_CACHE_SIZE:
+                self._streams.popitem(last=False)
+        return text
+    
+    def read_page(self, key: str) -> Optional[Tuple[str, str, Optional[str], Optional[str]]]:
+        location = self.lookup(key)
+        if location is None:
+            return None
+        text = self.read_stream(*location)
+        for match in TITLE_PATTERN.finditer(text):
+            title = html.unescape(match.group(1).decode('utf-8'))
+            if WikipediaScraper.normalize_title(title) != key:
+                continue
+            start = text.rfind(b'<page>', 0, match.start())
+            end = text.find(b'</page>', match.end()) + len(b'</page>')
+            page = ElementTree.fromstring(text[start:end])
+            redirect = page.find('redirect')
+            wikitext = page.findtext('revision/text') or ''
+            return title, wikitext, redirect.get('title') if redirect is not None else None, page.findtext('revision/id')
+        return None
+    
+    def load_article(self, key: str) -> Optional[Dict]:
+        for _ in range(MAX_REDIRECTS + 1):
+            page = self.read_page(key)
+            if page is None:
+                DUMP_READS.inc(result='missing')
+                return None
+            title, wikitext, redirect, revision_id = page
+            if redirect is None:
+                DUMP_READS.inc(result='hit')
+                article = convert_wikitext(title, wikitext)
+                article['article_key'] = key
+                article['revision_id'] = revision_id
+                article['raw_html_blob'] = pack_html(wikitext.encode('utf-8'))
+                return article
+            DUMP_READS.inc(result='redirect')
+            key = WikipediaScraper.normalize_title(redirect)
+        return None
+    
+    async def scrape_article(self, url: str) -> Dict:
+        key = WikipediaScraper.article_key(url)
+        if key is None:
+            raise ValueError("Invalid Wikipedia URL. Must be a valid English Wikipedia article URL.")
+        with StageTimer("scrape").stage('dump_read'):
+            article = await asyncio.to_thread(self.load_article, key)
+        if article is None:
+            raise Exception(f"Article '{key}' was not found in the offline Wikipedia dump")
+        return article
+    
+    async def refresh_article(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Optional[Dict]:
+        return await self.scrape_article(url)
+    
+    async def fetch_metadata(self, url: str) -> Dict:
+        article = await self.scrape_article(url)
+        return {'title': article['title'], 'article_key': article['article_key']}
+    
+    def close(self):
+        self._index.close()
+        self._map.close()
+        self._file.close()
+
+_dump_source: Optional[DumpSource] = None
+
+def get_dump_source() -> DumpSource:
+    global _dump_source
+    if _dump_source is None:
+        if not settings.WIKIPEDIA_DUMP_PATH or not settings.WIKIPEDIA_DUMP_INDEX_PATH:
+            raise ValueError("The offline Wikipedia dump is not configured (set WIKIPEDIA_DUMP_PATH and WIKIPEDIA_DUMP_INDEX_PATH).")
+        _dump_source = DumpSource(settings.WIKIPEDIA_DUMP_PATH, settings.WIKIPEDIA_DUMP_INDEX_PATH)
+    return _dump_source
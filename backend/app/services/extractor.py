@@ -0,0 +1,181 @@
+from lxml import etree
+from typing import Dict, List, Optional
+
+EXCLUDED_SECTIONS = {'Contents', 'References', 'External links', 'See also', 'Notes', 'Bibliography', 'Further reading'}
+SKIPPED_TAGS = {'table', 'script', 'style', 'sup'}
+SKIPPED_CLASSES = {'mw-editsection', 'navbox', 'reflist', 'toc'}
+ORGANIZATION_WORDS = ['university', 'institute', 'organization', 'company', 'corporation', 'laboratory']
+LOCATION_WORDS = ['city', 'country', 'state', 'kingdom', 'empire', 'united']
+
+MAX_SECTIONS = 15
+MAX_ENTITIES = 15
+MAX_LINKS = 150
+MAX_SUMMARY_PARAGRAPHS = 3
+MAX_CONTENT_CHARS = 120000
+
+
+class ArticleExtractor:
+    def __init__(self):
+        self._depth = 0
+        self._content_depth = 0
+        self._skip_depth = 0
+        self._title_depth = 0
+        self._page_title_depth = 0
+        self._block_depth = 0
+        self._block_tag = None
+        self._headline_depth = 0
+        self._link_depth = 0
+        self._link_href = ''
+        self._links_seen = 0
+
+        self._title_text: List[str] = []
+        self._page_title_text: List[str] = []
+        self._block_text: List[str] = []
+        self._headline_text: Optional[List[str]] = None
+        self._link_text: List[str] = []
+
+        self.title: Optional[str] = None
+        self.page_title: Optional[str] = None
+        self.canonical_url: Optional[str] = None
+        self.summary: List[str] = []
+        self.sections: List[str] = []
+        self.blocks: List[str] = []
+        self.people: Dict[str, None] = {}
+        self.organizations: Dict[str, None] = {}
+        self.locations: Dict[str, None] = {}
+
+    def start(self, tag, attrib):
+        self._depth += 1
+        classes = attrib.get('class', '').split()
+
+        if self._content_depth == 0:
+            if tag == 'div' and (attrib.get('id') == 'bodyContent' or 'mw-parser-output' in classes):
+                self._content_depth = self._depth
+            elif tag == 'h1' and 'firstHeading' in classes and self.title is None:
+                self._title_depth = self._depth
+            elif tag == 'title' and self.page_title is None:
+                self._page_title_depth = self._depth
+            elif tag == 'link' and attrib.get('rel') == 'canonical':
+                self.canonical_url = attrib.get('href')
+            return
+
+        if self._skip_depth == 0 and (tag in SKIPPED_TAGS or attrib.get('id') == 'toc' or SKIPPED_CLASSES.intersection(classes)):
+            self._skip_depth = self._depth
+
+        if tag == 'a' and 'href' in attrib and self._link_depth == 0 and self._links_seen < MAX_LINKS:
+            self._links_seen += 1
+            self._link_depth = self._depth
+            self._link_href = attrib['href']
+            self._link_text = []
+
+        if self._skip_depth:
+            return
+
+        if self._block_depth == 0 and tag in ('p', 'h2', 'h3'):
+            self._block_depth = self._depth
+            self._block_tag = tag
+            self._block_text = []
+            self._headline_text = None
+        elif self._block_tag != 'p' and self._block_depth and tag == 'span' and 'mw-headline' in classes:
+            self._headline_depth = self._depth
+            self._headline_text = []
+
+    def data(self, text):
+        if self._title_depth:
+            self._title_text.append(text)
+        elif self._page_title_depth:
+            self._page_title_text.append(text)
+
+        if self._link_depth:
+            self._link_text.append(text)
+
+        if self._skip_depth:
+            return
+
+        if self._block_depth:
+            self._block_text.append(text)
+        if self._headline_depth:
+            self._headline_text.append(text)
+
+    def end(self, tag):
+        depth = self._depth
+        self._depth -= 1
+
+        if self._title_depth == depth:
+            self._title_depth = 0
+            self.title = ''.join(self._title_text).strip()
+        elif self._page_title_depth == depth:
+            self._page_title_depth = 0
+            self.page_title = ''.join(self._page_title_text).replace(' - Wikipedia', '').strip()
+
+        if self._link_depth == depth:
+            self._link_depth = 0
+            self._add_entity(self._link_href, ''.join(self._link_text).strip())
+
+        if self._headline_depth == depth:
+            self._headline_depth = 0
+
+        if self._block_depth == depth:
+            self._block_depth = 0
+            self._finish_block()
+
+        if self._skip_depth == depth:
+            self._skip_depth = 0
+
+        if self._content_depth == depth:
+            self._content_depth = 0
+
+    def close(self) -> Dict:
+        content_text = '\n\n'.join(self.blocks)
+        return {
+            'title': self.title or self.page_title or "Unknown Title",
+            'canonical_url': self.canonical_url,
+            'summary': ' '.join(self.summary),
+            'sections': self.sections[:MAX_SECTIONS],
+            'key_entities': {
+                'people': list(self.people)[:MAX_ENTITIES],
+                'organizations': list(self.organizations)[:MAX_ENTITIES],
+                'locations': list(self.locations)[:MAX_ENTITIES]
+            },
+            'content_text': content_text[:MAX_CONTENT_CHARS]
+        }
+
+    def _finish_block(self):
+        text = ''.join(self._block_text).strip()
+        if self._block_tag == 'p':
+            if len(text) > 30:
+                self.blocks.append(text)
+            if len(text) > 50 and len(self.summary) < MAX_SUMMARY_PARAGRAPHS:
+                self.summary.append(text)
+            return
+
+        if self._headline_text is not None:
+            text = ''.join(self._headline_text).strip()
+        if not text or text in EXCLUDED_SECTIONS:
+            return
+        self.sections.append(text)
+        self.blocks.append(f"\n## {text}\n")
+
+    def _add_entity(self, href: str, text: str):
+        kind = entity_kind(href, text)
+        if kind:
+            getattr(self, kind)[text] = None
+
+
+def entity_kind(href: str, text: str) -> Optional[str]:
+    if '/wiki/' not in href or ':' in href or len(text) <= 2:
+        return None
+    href = href.lower()
+    if any(word in href for word in ORGANIZATION_WORDS):
+        return 'organizations'
+    if any(word in href for word in LOCATION_WORDS):
+        return 'locations'
+    if len(text.split()) <= 3 and text[0].isupper() and not text.isupper():
+        return 'people'
+    return None
+
+
+def extract_article(html: bytes) -> Dict:
+    parser = etree.HTMLParser(target=ArticleExtractor(), encoding='utf-8')
+    parser.feed(html)
+    return parser.close()
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.quiz_service import QuizService
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_EVENTS = {'done', 'failed'}
+
+class GenerationJob:
+    def __init__(self, url: str, source: str = 'web'):
+        self.id = uuid.uuid4().hex
+        self.url = url
+        self.source = source
+        self.status = 'pending'
+        self.created_at = time.monotonic()
+        self.first_question_seconds: Optional[float] = None
+        self.quiz_id: Optional[int] = None
+        self.error: Optional[str] = None
+        self.events: List[Tuple[int, str, str]] = []
+        self._subscribers: Set[asyncio.Queue] = set()
+    
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+    
+    def publish(self, event: str, data: dict):
+        if event == 'question' and self.first_question_seconds is None:
+            self.first_question_seconds = time.monotonic() - self.created_at
+        entry = (len(self.events) + 1, event, json.dumps(data, default=str))
+        self.events.append(entry)
+        for queue in self._subscribers:
+            queue.put_nowait(entry)
+    
+    async def stream(self, last_event_id: int = 0) -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue()
+        for entry in self.events:
+            if entry[0] > last_event_id:
+                queue.put_nowait(entry)
+        if self.finished and queue.empty():
+            return
+        if not self.finished:
+            self._subscribers.add(queue)
+        
+        try:
+            while True:
+                try:
+                    event_id, event, data = await asyncio.wait_for(queue.get(), settings.SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if self.finished and queue.empty():
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+                if event in TERMINAL_EVENTS:
+                    return
+        finally:
+            self._subscribers.discard(queue)
+
+class JobManager:
+    def __init__(self):
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._tasks: Set[asyncio.Task] = set()
+    
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        return self._jobs.get(job_id)
+    
+    def submit(self, url: str, num_questions: Optional[int] = None, source: str = 'web') -> GenerationJob:
+        job = GenerationJob(url, source)
+        self._jobs[job.id] = job
+        task = asyncio.create_task(self._run(job, num_questions))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+    
+    async def _run(self, job: GenerationJob, num_questions: Optional[int]):
+        job.status = 'running'
+        job.publish('stage', {'stage': 'started'})
+        try:
+            async with AsyncSessionLocal() as db:
+                quiz = await QuizService(db, on_event=job.publish, source=job.source).generate_quiz(job.url, num_questions)
+            job.quiz_id = quiz.id
+            job.status = 'done'
+            job.publish('done', {'quiz_id': quiz.id, 'quiz': quiz.model_dump(mode='json')})
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+            job.publish('failed', {'detail': str(e)})
+        finally:
+            logger.info(
+                "generation job %s status=%s total=%.0fms first_question=%s",
+                job.id, job.status, (time.monotonic() - job.created_at) * 1000,
+                f"{job.first_question_seconds * 1000:.0f}ms" if job.first_question_seconds is not None else "n/a"
+            )
+            asyncio.get_running_loop().call_later(settings.JOB_RETENTION_SECONDS, self._jobs.pop, job.id, None)
+
+job_manager = JobManager()
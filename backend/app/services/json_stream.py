@@ -0,0 +1,106 @@
+import json
+from typing import List, Tuple
+
+def _drop_trailing_comma(chars: List[str]) -> bool:
+    while chars and chars[-1].isspace():
+        chars.pop()
+    if chars and chars[-1] == ',':
+        chars.pop()
+        return True
+    return False
+
+def extract_json(text: str) -> dict:
+    return parse_json_object(text)[0]
+
+def parse_json_object(text: str) -> Tuple[dict, bool]:
+    start = text.find('{')
+    if start < 0:
+        raise ValueError("No JSON object found in the response")
+    
+    chars: List[str] = []
+    stack: List[str] = []
+    cuts: List[Tuple[int, List[str]]] = []
+    in_string = False
+    escaped = False
+    repaired = False
+    for char in text[start:]:
+        if in_string:
+            chars.append(char)
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        
+        if char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append('}' if char == '{' else ']')
+        elif char in '}]':
+            if not stack or char != stack[-1]:
+                repaired = True
+                continue
+            stack.pop()
+            repaired = _drop_trailing_comma(chars) or repaired
+        elif char == ',':
+            cuts.append((len(chars), list(stack)))
+        chars.append(char)
+        if not stack:
+            break
+    
+    if stack:
+        if not cuts:
+            raise ValueError("The JSON object in the response is truncated")
+        length, stack = cuts[-1]
+        chars = chars[:length]
+        _drop_trailing_comma(chars)
+        chars.extend(reversed(stack))
+        repaired = True
+    
+    data = json.loads(''.join(chars))
+    if not isinstance(data, dict):
+        raise ValueError("The response is not a JSON object")
+    return data, repaired
+
+class QuestionStreamParser:
+    def __init__(self):
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._start = None
+        self._buffer = []
+        self.rejected = 0
+    
+    def feed(self, text: str) -> List[dict]:
+        objects = []
+        for char in text:
+            if self._start is not None:
+                self._buffer.append(char)
+            
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                if char == '{' and self._stack == ['{', '[']:
+                    self._start = len(self._stack)
+                    self._buffer = [char]
+                self._stack.append(char)
+            elif char in '}]' and self._stack:
+                self._stack.pop()
+                if self._start is not None and len(self._stack) == self._start:
+                    self._start = None
+                    try:
+                        objects.append(extract_json(''.join(self._buffer)))
+                    except ValueError:
+                        self.rejected += 1
+        return objects
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import random
+import re
+from pathlib import Path
+from typing import AsyncIterator, List, NamedTuple, Optional
+from app.core.config import settings
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+NUM_QUESTIONS_PATTERN = re.compile(r'create (\d+) high-quality quiz questions')
+SECTIONS_PATTERN = re.compile(r'^(?:Available )?Sections: (.*)$', re.MULTILINE)
+STREAM_CHUNK_CHARS = 64
+
+class LLMMessage(NamedTuple):
+    content: str
+
+class StubRateLimitError(Exception):
+    status_code = 429
+
+class StubLLM:
+    def __init__(self, recording: str, latency: float = 0.0, jitter: float = 0.0, seed: Optional[int] = None, rate_limit_probability: float = 0.0):
+        path = Path(recording)
+        if not path.is_absolute():
+            path = BACKEND_DIR / path
+        data = json.loads(path.read_text(encoding="utf-8"))
+        self.questions: List[dict] = data.get('questions') or data.get('quiz') or []
+        self.topics: List[str] = data.get('topics') or data.get('related_topics') or []
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_probability = rate_limit_probability
+        self.random = random.Random(seed)
+        self.calls = 0
+    
+    async def ainvoke(self, prompt: str) -> LLMMessage:
+        await asyncio.sleep(self._delay())
+        self._maybe_rate_limit()
+        return LLMMessage(self.respond(prompt))
+    
+    async def astream(self, prompt: str) -> AsyncIterator[LLMMessage]:
+        self._maybe_rate_limit()
+        text = self.respond(prompt)
+        chunks = [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)]
+        delay = self._delay()
+        await asyncio.sleep(delay / 2)
+        for chunk in chunks:
+            await asyncio.sleep(delay / 2 / len(chunks))
+            yield LLMMessage(chunk)
+    
+    def respond(self, prompt: str) -> str:
+        self.calls += 1
+        data = {}
+        match = NUM_QUESTIONS_PATTERN.search(prompt)
+        if match:
+            data['questions'] = self._questions(int(match.group(1)), prompt)
+        if 'related Wikipedia topics' in prompt:
+            data['topics'] = self.topics[:8]
+        return json.dumps(data)
+    
+    def _questions(self, count: int, prompt: str) -> List[dict]:
+        match = SECTIONS_PATTERN.search(prompt)
+        sections = set(match.group(1).split(', ')) if match else set()
+        ordered = sorted(self.questions, key=lambda q: q.get('section_reference') not in sections)
+        questions = []
+        for i in range(count if ordered else 0):
+            question = dict(ordered[i % len(ordered)])
+            if i >= len(ordered):
+                question['question'] = f"{question['question']} ({i // len(ordered) + 1})"
+            questions.append(question)
+        return questions
+    
+    def _maybe_rate_limit(self):
+        if self.rate_limit_probability and self.random.random() < self.rate_limit_probability:
+            raise StubRateLimitError("429 RESOURCE_EXHAUSTED: stub quota exceeded")
+    
+    def _delay(self) -> float:
+        return max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+
+def create_llm(provider: Optional[str] = None):
+    provider = provider or settings.LLM_PROVIDER
+    if provider == "stub":
+        return StubLLM(
+            settings.STUB_LLM_RECORDING,
+            latency=settings.STUB_LLM_LATENCY_SECONDS,
+            jitter=settings.STUB_LLM_JITTER_SECONDS,
+            seed=settings.STUB_LLM_SEED,
+            rate_limit_probability=settings.STUB_LLM_RATE_LIMIT_PROBABILITY
+        )
+    if provider == "gemini":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        
+        if not settings.GOOGLE_API_KEY:
+            raise ValueError("GOOGLE_API_KEY is required when LLM_PROVIDER is 'gemini'")
+        return ChatGoogleGenerativeAI(
+            model="models/gemini-2.5-flash",
+            google_api_key=settings.GOOGLE_API_KEY,
+            temperature=0.7
+        )
+    raise ValueError(f"Unknown LLM_PROVIDER '{provider}'")
@@ -0,0 +1,242 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple, TypeVar
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+RATE_LIMIT_MARKERS = ("429", "resource_exhausted", "resource exhausted", "quota", "rate limit")
+UNAVAILABLE_MARKERS = ("503", "unavailable", "overloaded")
+
+LLM_CALLS = Counter(
+    "llm_calls_total",
+    "Scheduled LLM calls by priority and result (ok, rate_limited, failed)",
+    ("priority", "result")
+)
+
+LLM_RETRIES = Counter(
+    "llm_retries_total",
+    "LLM call retries by reason (rate_limit, unavailable)",
+    ("reason",)
+)
+
+LLM_QUEUE_WAIT = Histogram(
+    "llm_queue_wait_seconds",
+    "Time an LLM call waited for a concurrency slot and rate-limit budget",
+    ("priority",)
+)
+
+class LLMRateLimitError(Exception):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def classify_error(error: BaseException) -> str:
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    text = f"{type(error).__name__} {error}".lower()
+    if status == 429 or any(marker in text for marker in RATE_LIMIT_MARKERS):
+        return "rate_limit"
+    if status == 503 or any(marker in text for marker in UNAVAILABLE_MARKERS):
+        return "unavailable"
+    return "fatal"
+
+class TokenBucket:
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def wait_time(self, amount: float) -> float:
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        return max(0.0, (min(amount, self.capacity) - self.tokens) / self.rate)
+    
+    def reserve(self, amount: float):
+        if self.rate <= 0:
+            return
+        self._refill()
+        self.tokens -= amount
+
+class LLMScheduler:
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        initial_concurrency: int,
+        min_concurrency: int,
+        max_concurrency: int,
+        target_latency: float,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.active = 0
+        self._waiters: List[Tuple[int, int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.TimerHandle]] = None
+    
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, _, future in self._waiters if not future.done())
+    
+    async def run(self, call: Callable[[], Awaitable[T]], tokens: int = 0, priority: int = INTERACTIVE) -> T:
+        name = PRIORITY_NAMES.get(priority, str(priority))
+        for attempt in range(self.max_retries + 1):
+            start = time.monotonic()
+            await self._acquire(priority, tokens)
+            LLM_QUEUE_WAIT.observe(time.monotonic() - start, priority=name)
+            try:
+                call_start = time.monotonic()
+                try:
+                    result = await call()
+                except Exception as e:
+                    self.record_usage(tokens, 0)
+                    reason = classify_error(e)
+                    if reason == "fatal":
+                        LLM_CALLS.inc(priority=name, result="failed")
+                        raise
+                    self._on_overload(reason)
+                    if attempt == self.max_retries:
+                        LLM_CALLS.inc(priority=name, result="rate_limited")
+                        raise LLMRateLimitError(
+                            "The AI service is busy right now, please retry shortly.", self._backoff(attempt)
+                        ) from e
+                    LLM_RETRIES.inc(reason=reason)
+                    logger.warning("LLM call hit %s (attempt %d/%d): %s", reason, attempt + 1, self.max_retries + 1, e)
+                else:
+                    self._on_success(time.monotonic() - call_start)
+                    LLM_CALLS.inc(priority=name, result="ok")
+                    return result
+            finally:
+                self._release()
+            await asyncio.sleep(random.uniform(0, self._backoff(attempt)))
+    
+    def record_usage(self, reserved: int, used: int):
+        self.tokens.reserve(used - reserved)
+    
+    def _backoff(self, attempt: int) -> float:
+        return min(self.backoff_max, self.backoff_base * 2 ** attempt)
+    
+    def _on_success(self, latency: float):
+        if latency > self.target_latency:
+            self.limit = max(self.min_concurrency, self.limit * 0.9)
+        else:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+        self._dispatch()
+    
+    def _on_overload(self, reason: str):
+        factor = 0.5 if reason == "rate_limit" else 0.75
+        self.limit = max(self.min_concurrency, self.limit * factor)
+    
+    async def _acquire(self, priority: int, tokens: int):
+        if not self.queued and self._admit(tokens):
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), tokens, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.record_usage(tokens, 0)
+                self._release()
+            future.cancel()
+            self._dispatch()
+            raise
+    
+    def _admit(self, tokens: int) -> bool:
+        if self.active >= int(self.limit):
+            return False
+        wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+        if wait > 0:
+            self._wake_after(wait)
+            return False
+        self.requests.reserve(1)
+        self.tokens.reserve(tokens)
+        self.active += 1
+        return True
+    
+    def _wake_after(self, delay: float):
+        loop = asyncio.get_running_loop()
+        when = loop.time() + delay
+        if self._wakeup is not None:
+            pending_loop, handle = self._wakeup
+            if pending_loop is loop and not handle.cancelled() and handle.when() <= when:
+                return
+            handle.cancel()
+        self._wakeup = (loop, loop.call_at(when, self._on_wakeup))
+    
+    def _on_wakeup(self):
+        self._wakeup = None
+        self._dispatch()
+    
+    def _release(self):
+        self.active -= 1
+        self._dispatch()
+    
+    def _dispatch(self):
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._admit(tokens):
+                return
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+
+scheduler = LLMScheduler(
+    requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+    initial_concurrency=settings.LLM_INITIAL_CONCURRENCY,
+    min_concurrency=settings.LLM_MIN_CONCURRENCY,
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    target_latency=settings.LLM_TARGET_LATENCY_SECONDS,
+    max_retries=settings.LLM_MAX_RETRIES,
+    backoff_base=settings.LLM_BACKOFF_BASE_SECONDS,
+    backoff_max=settings.LLM_BACKOFF_MAX_SECONDS
+)
+
+LLM_CONCURRENCY_LIMIT = Gauge(
+    "llm_concurrency_limit",
+    "Current adaptive limit on concurrent LLM calls",
+    lambda: int(scheduler.limit)
+)
+
+LLM_CALLS_IN_FLIGHT = Gauge(
+    "llm_calls_in_flight",
+    "LLM calls currently holding a concurrency slot",
+    lambda: scheduler.active
+)
+
+LLM_CALLS_QUEUED = Gauge(
+    "llm_calls_queued",
+    "LLM calls waiting for a concurrency slot or rate-limit budget",
+    lambda: scheduler.queued
+)
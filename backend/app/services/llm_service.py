@@ -1,10 +1,61 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import PromptTemplate
-from pydantic import BaseModel, Field
-from typing import List
+from pydantic import BaseModel, Field, ValidationError
+from typing import Callable, List, Optional, Set, Tuple
+from app.core.clients import clients
 from app.core.config import settings
-import json
-import re
+from app.core.metrics import STAGE_DURATION, Counter
+from app.services.content_planner import estimate_tokens, plan_content, plan_shards
+from app.services.json_stream import QuestionStreamParser, extract_json, parse_json_object
+from app.services.llm_scheduler import INTERACTIVE, LLMRateLimitError, scheduler
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "LLM tokens by direction (input, output); estimated when the provider reports no usage",
+    ("direction",)
+)
+
+LLM_PARSE_FAILURES = Counter(
+    "llm_parse_failures_total",
+    "LLM responses or questions that could not be used, by reason (invalid_json, malformed_question)",
+    ("reason",)
+)
+
+LLM_QUESTION_RESPONSES = Counter(
+    "llm_question_responses_total",
+    "Question-generating LLM responses by result (complete, salvaged, short, failed)",
+    ("result",)
+)
+
+LLM_SALVAGED_QUESTIONS = Counter(
+    "llm_salvaged_questions_total",
+    "Valid questions recovered from LLM responses that were not parseable as a whole"
+)
+
+LLM_CALLS_SAVED = Counter(
+    "llm_calls_saved_total",
+    "Damaged LLM responses that were salvaged instead of regenerating the whole quiz"
+)
+
+LLM_TOPUP_CALLS = Counter(
+    "llm_topup_calls_total",
+    "Follow-up LLM calls that ask only for the questions missing from a previous response"
+)
+
+RELATED_TOPICS_FALLBACKS = Counter(
+    "related_topics_fallbacks_total",
+    "Related topics replaced by generic fallbacks, by reason (rate_limited, invalid_json, empty, timeout, error)",
+    ("reason",)
+)
+
+DIFFICULTY_INSTRUCTIONS = {
+    None: "varying difficulty levels (easy, medium, hard)",
+    'easy': "easy difficulty only: basic facts, definitions and directly stated information",
+    'medium': "medium difficulty only: connections, implications and multi-step reasoning",
+    'hard': "hard difficulty only: deep analysis, nuanced understanding and complex relationships",
+}
 
 class QuizQuestion(BaseModel):
     question: str = Field(description="The quiz question text")
@@ -18,129 +69,222 @@ class QuizOutput(BaseModel):
     questions: List[QuizQuestion] = Field(description="List of quiz questions")
 
 class LLMService:
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model="models/gemini-2.5-flash",
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0.7
-        )
+    def __init__(self, llm=None, priority: int = INTERACTIVE):
+        self.llm = llm or clients.llm
+        self.priority = priority
     
-    def generate_quiz(self, title: str, content: str, sections: List[str], num_questions: int = 8) -> List[dict]:
-        quiz_prompt = PromptTemplate(
-            input_variables=["title", "content", "sections", "num_questions"],
-            template="""You are an expert quiz creator. Based on the following Wikipedia article, create {num_questions} high-quality quiz questions.
-
-Article Title: {title}
-
-Available Sections: {sections}
-
-Article Content:
-{content}
-
-CRITICAL INSTRUCTIONS:
-1. Base ALL questions STRICTLY on the provided article content - DO NOT use external knowledge
-2. Create questions with varying difficulty levels (easy, medium, hard)
-3. Each question must have EXACTLY 4 options (A, B, C, D format)
-4. Ensure questions cover different sections of the article
-5. Make explanations reference specific parts of the article
-6. Ensure factual accuracy - verify answers are in the text
-7. Avoid ambiguous questions
-
-Generate EXACTLY {num_questions} questions in the following JSON format:
-{{
-  "questions": [
-    {{
-      "question": "Question text here?",
-      "options": ["Option A", "Option B", "Option C", "Option D"],
-      "answer": "Correct option text",
-      "difficulty": "easy|medium|hard",
-      "explanation": "Brief explanation referencing the article",
-      "section_reference": "Section name from the article"
-    }}
-  ]
-}}
-
-Return ONLY valid JSON, no additional text."""
-        )
-        
-        prompt_text = quiz_prompt.format(
-            title=title,
-            content=content[:12000],
-            sections=", ".join(sections),
-            num_questions=num_questions
+    async def generate_quiz(self, title: str, content: str, sections: List[str], num_questions: int = 8, on_question: Optional[Callable[[dict], None]] = None, difficulty: Optional[str] = None) -> List[dict]:
+        if estimate_tokens(content) > settings.MAP_REDUCE_THRESHOLD_TOKENS:
+            return await self._generate_quiz_sharded(title, content, num_questions, on_question, difficulty)
+        content = plan_content(content, settings.CONTENT_TOKEN_BUDGET)
+        return await self._generate_quiz_part(title, content, sections, num_questions, on_question, difficulty)
+    
+    async def _generate_quiz_sharded(self, title: str, content: str, num_questions: int, on_question: Optional[Callable[[dict], None]], difficulty: Optional[str]) -> List[dict]:
+        shards = plan_shards(content, num_questions, settings.MAP_REDUCE_MAX_SHARDS, settings.SHARD_TOKEN_BUDGET)
+        results = await asyncio.gather(
+            *(self._generate_quiz_part(title, shard.content, shard.sections, shard.num_questions, on_question, difficulty) for shard in shards),
+            return_exceptions=True
         )
-        
+        parts = [result for result in results if not isinstance(result, BaseException)]
+        if not parts:
+            raise results[0]
+        return self._merge_questions(parts, num_questions)
+    
+    async def _generate_quiz_part(self, title: str, content: str, sections: List[str], num_questions: int, on_question: Optional[Callable[[dict], None]], difficulty: Optional[str] = None) -> List[dict]:
         try:
-            response = self.llm.invoke(prompt_text)
-            content_text = response.content
-            
-            json_match = re.search(r'\{.*\}', content_text, re.DOTALL)
-            if json_match:
-                content_text = json_match.group()
-            
-            quiz_data = json.loads(content_text)
-            
-            questions = []
-            for q in quiz_data.get('questions', []):
-                if len(q.get('options', [])) == 4:
-                    questions.append({
-                        'question': q['question'],
-                        'options': q['options'],
-                        'answer': q['answer'],
-                        'difficulty': q.get('difficulty', 'medium'),
-                        'explanation': q['explanation'],
-                        'section_reference': q.get('section_reference', 'General')
-                    })
-            
-            return questions[:num_questions]
+            questions, _ = await self._generate_questions("quiz_generation", title, content, sections, num_questions, on_question, difficulty)
+            return questions
             
+        except LLMRateLimitError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to generate quiz: {str(e)}")
     
-    def generate_related_topics(self, title: str, content: str, sections: List[str]) -> List[str]:
-        topics_prompt = PromptTemplate(
-            input_variables=["title", "content", "sections"],
-            template="""Based on the following Wikipedia article, suggest 5-8 related Wikipedia topics that would be interesting for further reading.
-
-Article Title: {title}
-Sections: {sections}
-Content Summary: {content}
-
-INSTRUCTIONS:
-1. Suggest topics that are directly related to the article
-2. Topics should be specific enough to have their own Wikipedia pages
-3. Provide diverse topics covering different aspects mentioned in the article
-4. Return ONLY a JSON array of topic names
-
-Format:
-{{
-  "topics": ["Topic 1", "Topic 2", "Topic 3", "Topic 4", "Topic 5"]
-}}
-
-Return ONLY valid JSON, no additional text."""
-        )
-        
-        prompt_text = topics_prompt.format(
+    async def generate_related_topics(self, title: str, content: str, sections: List[str]) -> List[str]:
+        prompt_text = clients.prompt("related_topics").format(
             title=title,
-            content=content[:3000],
+            content=plan_content(content, settings.TOPICS_TOKEN_BUDGET),
             sections=", ".join(sections[:5])
         )
         
         try:
-            response = self.llm.invoke(prompt_text)
-            content_text = response.content
-            
-            json_match = re.search(r'\{.*\}', content_text, re.DOTALL)
-            if json_match:
-                content_text = json_match.group()
-            
-            topics_data = json.loads(content_text)
+            topics_data = self._parse_json(await self._invoke(prompt_text))
             return topics_data.get('topics', [])[:8]
             
         except Exception as e:
-            return [
-                f"{title} history",
-                f"Related figures to {title}",
-                "Historical context",
-                "Modern impact"
-            ]
+            if isinstance(e, LLMRateLimitError):
+                reason = 'rate_limited'
+            elif isinstance(e, ValueError):
+                reason = 'invalid_json'
+            else:
+                reason = 'error'
+            logger.warning("Related topics for %r fell back to defaults (%s): %s", title, reason, e)
+            RELATED_TOPICS_FALLBACKS.inc(reason=reason)
+            return self.fallback_topics(title)
+    
+    async def generate_quiz_and_topics(self, title: str, content: str, sections: List[str], num_questions: int = 8, on_question: Optional[Callable[[dict], None]] = None) -> Tuple[List[dict], List[str]]:
+        try:
+            questions, data = await self._generate_questions(
+                "combined_generation", title, plan_content(content, settings.CONTENT_TOKEN_BUDGET), sections, num_questions, on_question
+            )
+        except LLMRateLimitError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to generate quiz: {str(e)}")
+        
+        topics = data.get('topics', [])[:8]
+        if not topics:
+            RELATED_TOPICS_FALLBACKS.inc(reason='empty')
+            topics = self.fallback_topics(title)
+        return questions, topics
+    
+    async def _generate_questions(self, prompt_name: str, title: str, content: str, sections: List[str], num_questions: int, on_question: Optional[Callable[[dict], None]], difficulty: Optional[str] = None) -> Tuple[List[dict], dict]:
+        prompt_text = clients.prompt(prompt_name).format(
+            title=title,
+            content=content,
+            sections=", ".join(sections),
+            num_questions=num_questions,
+            difficulty=DIFFICULTY_INSTRUCTIONS[difficulty]
+        )
+        response_text = await self._complete(prompt_text, num_questions, on_question)
+        questions, data = self._salvage_questions(response_text, num_questions)
+        
+        for _ in range(settings.LLM_TOPUP_MAX_CALLS):
+            missing = num_questions - len(questions)
+            if missing <= 0:
+                break
+            LLM_TOPUP_CALLS.inc()
+            prompt_text = clients.prompt("quiz_generation").format(
+                title=title,
+                content=content,
+                sections=", ".join(sections),
+                num_questions=missing,
+                difficulty=DIFFICULTY_INSTRUCTIONS[difficulty]
+            )
+            extra, _ = self._salvage_questions(await self._complete(prompt_text, missing, on_question), missing)
+            seen = {q['question'].strip().lower() for q in questions}
+            questions += [q for q in extra if q['question'].strip().lower() not in seen][:missing]
+        
+        if not questions:
+            raise ValueError("The AI response contained no valid questions")
+        return questions, data
+    
+    def _salvage_questions(self, response_text: str, num_questions: int) -> Tuple[List[dict], dict]:
+        try:
+            with STAGE_DURATION.time(pipeline="llm", stage="parse_json"):
+                data, damaged = parse_json_object(response_text)
+            candidates = data.get('questions')
+        except ValueError:
+            LLM_PARSE_FAILURES.inc(reason='invalid_json')
+            data, damaged, candidates = {}, True, None
+        if not isinstance(candidates, list):
+            parser = QuestionStreamParser()
+            candidates = parser.feed(response_text)
+            LLM_PARSE_FAILURES.inc(parser.rejected, reason='malformed_question')
+        
+        questions = self._parse_questions({'questions': candidates}, num_questions)
+        if not questions:
+            result = 'failed'
+        elif damaged:
+            result = 'salvaged'
+            LLM_SALVAGED_QUESTIONS.inc(len(questions))
+            LLM_CALLS_SAVED.inc()
+        else:
+            result = 'complete' if len(questions) >= num_questions else 'short'
+        LLM_QUESTION_RESPONSES.inc(result=result)
+        return questions, data
+    
+    def fallback_topics(self, title: str) -> List[str]:
+        return [
+            f"{title} history",
+            f"Related figures to {title}",
+            "Historical context",
+            "Modern impact"
+        ]
+    
+    def _merge_questions(self, parts: List[List[dict]], num_questions: int) -> List[dict]:
+        merged = []
+        seen = set()
+        for round_ in range(max(len(part) for part in parts)):
+            for part in parts:
+                if round_ >= len(part):
+                    continue
+                question = part[round_]
+                text = question['question'].strip().lower()
+                if text not in seen:
+                    seen.add(text)
+                    merged.append(question)
+        return merged[:num_questions]
+    
+    def _parse_json(self, content_text: str) -> dict:
+        with STAGE_DURATION.time(pipeline="llm", stage="parse_json"):
+            try:
+                return extract_json(content_text)
+            except ValueError:
+                LLM_PARSE_FAILURES.inc(reason='invalid_json')
+                raise
+    
+    def _record_tokens(self, prompt_text: str, response_text: str, usage: Optional[dict]) -> int:
+        usage = usage or {}
+        input_tokens = usage.get('input_tokens') or estimate_tokens(prompt_text)
+        output_tokens = usage.get('output_tokens') or estimate_tokens(response_text)
+        LLM_TOKENS.inc(input_tokens, direction='input')
+        LLM_TOKENS.inc(output_tokens, direction='output')
+        return input_tokens + output_tokens
+    
+    async def _invoke(self, prompt_text: str) -> str:
+        reserved = estimate_tokens(prompt_text) + settings.LLM_RESERVED_OUTPUT_TOKENS
+        response = await scheduler.run(lambda: self.llm.ainvoke(prompt_text), tokens=reserved, priority=self.priority)
+        used = self._record_tokens(prompt_text, response.content, getattr(response, 'usage_metadata', None))
+        scheduler.record_usage(reserved, used)
+        return response.content
+    
+    async def _complete(self, prompt_text: str, num_questions: int, on_question: Optional[Callable[[dict], None]]) -> str:
+        if on_question is None:
+            return await self._invoke(prompt_text)
+        
+        emitted: Set[str] = set()
+        
+        async def stream() -> Tuple[str, dict]:
+            parser = QuestionStreamParser()
+            chunks = []
+            usage = {'input_tokens': 0, 'output_tokens': 0}
+            async for chunk in self.llm.astream(prompt_text):
+                chunks.append(chunk.content)
+                for key, value in (getattr(chunk, 'usage_metadata', None) or {}).items():
+                    if key in usage:
+                        usage[key] += value
+                for q in parser.feed(chunk.content):
+                    question = self._normalize_question(q)
+                    if question and len(emitted) < num_questions and question['question'] not in emitted:
+                        emitted.add(question['question'])
+                        on_question(question)
+            return ''.join(chunks), usage
+        
+        reserved = estimate_tokens(prompt_text) + settings.LLM_RESERVED_OUTPUT_TOKENS
+        response_text, usage = await scheduler.run(stream, tokens=reserved, priority=self.priority)
+        scheduler.record_usage(reserved, self._record_tokens(prompt_text, response_text, usage))
+        return response_text
+    
+    def _normalize_question(self, q: dict) -> Optional[dict]:
+        if not isinstance(q, dict):
+            return None
+        fields = {'difficulty': 'medium', 'section_reference': 'General'}
+        fields.update((key, value) for key, value in q.items() if value is not None)
+        try:
+            question = QuizQuestion.model_validate(fields)
+        except ValidationError:
+            return None
+        if len(question.options) != 4 or not question.question.strip():
+            return None
+        return question.model_dump()
+    
+    def _parse_questions(self, quiz_data: dict, num_questions: int) -> List[dict]:
+        questions = []
+        for q in quiz_data.get('questions', []):
+            question = self._normalize_question(q)
+            if question:
+                questions.append(question)
+            else:
+                LLM_PARSE_FAILURES.inc(reason='malformed_question')
+        return questions[:num_questions]
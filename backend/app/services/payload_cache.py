@@ -0,0 +1,73 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+from app.core.compression import gzip_bytes
+from app.core.config import settings
+from app.core.metrics import Counter
+
+PAYLOAD_CACHE_LOOKUPS = Counter(
+    "quiz_payload_cache_lookups_total",
+    "Serialized quiz payload lookups by source (memory, revalidated, database, rebuilt)",
+    ("source",)
+)
+
+class Payload(NamedTuple):
+    body: bytes
+    etag: str
+    gzip: Optional[bytes] = None
+    
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip or b'')
+
+def make_payload(body: bytes) -> Payload:
+    compressed = gzip_bytes(body) if len(body) >= settings.COMPRESSION_MIN_BYTES else None
+    return Payload(body=body, etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"', gzip=compressed)
+
+class PayloadCache:
+    def __init__(self, max_bytes: int, revalidate_after: float = 0.0):
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self.bytes = 0
+        self._entries: "OrderedDict[int, Payload]" = OrderedDict()
+        self._checked: Dict[int, float] = {}
+    
+    def get(self, quiz_id: int) -> Optional[Payload]:
+        payload = self._entries.get(quiz_id)
+        if payload is not None:
+            self._entries.move_to_end(quiz_id)
+        return payload
+    
+    def put(self, quiz_id: int, payload: Payload):
+        if payload.size > self.max_bytes:
+            return
+        self.discard(quiz_id)
+        self._entries[quiz_id] = payload
+        self._checked[quiz_id] = time.monotonic()
+        self.bytes += payload.size
+        while self.bytes > self.max_bytes:
+            evicted_id, evicted = self._entries.popitem(last=False)
+            self._checked.pop(evicted_id, None)
+            self.bytes -= evicted.size
+    
+    def needs_revalidation(self, quiz_id: int) -> bool:
+        checked = self._checked.get(quiz_id)
+        return checked is None or time.monotonic() - checked >= self.revalidate_after
+    
+    def mark_valid(self, quiz_id: int):
+        if quiz_id in self._entries:
+            self._checked[quiz_id] = time.monotonic()
+    
+    def discard(self, quiz_id: int):
+        payload = self._entries.pop(quiz_id, None)
+        self._checked.pop(quiz_id, None)
+        if payload is not None:
+            self.bytes -= payload.size
+    
+    def clear(self):
+        self._entries.clear()
+        self._checked.clear()
+        self.bytes = 0
+
+payload_cache = PayloadCache(max_bytes=settings.PAYLOAD_CACHE_MAX_BYTES, revalidate_after=settings.PAYLOAD_CACHE_REVALIDATE_SECONDS)
@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import re
+import struct
+import zlib
+from typing import Dict, List, NamedTuple, Sequence, Set, Tuple
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.metrics import QUESTIONS_DEDUPLICATED
+from app.models.quiz import Question, QuestionBand, QuestionSignature
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+SHINGLE_SIZE = 5
+NUM_BANDS = 18
+BAND_ROWS = 4
+NUM_PERMUTATIONS = NUM_BANDS * BAND_ROWS
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+SIGNATURE_FORMAT = f'>{NUM_PERMUTATIONS}I'
+LOOKUP_CHUNK = 400
+
+def _permutation(index: int) -> Tuple[int, int]:
+    digest = hashlib.blake2b(f'minhash:{index}'.encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'big') % (MERSENNE_PRIME - 1) + 1, int.from_bytes(digest[8:], 'big') % MERSENNE_PRIME
+
+PERMUTATIONS = [_permutation(index) for index in range(NUM_PERMUTATIONS)]
+
+class Fingerprint(NamedTuple):
+    signature: Tuple[int, ...]
+    buckets: List[int]
+
+def shingles(text: str) -> Set[int]:
+    normalized = ' '.join(WORD_PATTERN.findall(text.lower()))
+    return {
+        zlib.crc32(normalized[i:i + SHINGLE_SIZE].encode())
+        for i in range(max(1, len(normalized) - SHINGLE_SIZE + 1))
+    }
+
+def minhash(text: str) -> Tuple[int, ...]:
+    hashes = shingles(text)
+    return tuple(min((a * h + b) % MERSENNE_PRIME for h in hashes) & MAX_HASH for a, b in PERMUTATIONS)
+
+def band_buckets(signature: Sequence[int], bands: int = NUM_BANDS, rows: int = BAND_ROWS) -> List[int]:
+    buckets = []
+    for band in range(bands):
+        values = signature[band * rows:(band + 1) * rows]
+        digest = hashlib.blake2b(struct.pack(f'>B{rows}I', band, *values), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'big', signed=True))
+    return buckets
+
+def fingerprint(question_text: str, answer: str) -> Fingerprint:
+    signature = minhash(f"{question_text} {answer}")
+    return Fingerprint(signature, band_buckets(signature))
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERMUTATIONS
+
+def pack_signature(signature: Sequence[int]) -> bytes:
+    return struct.pack(SIGNATURE_FORMAT, *signature)
+
+def unpack_signature(data: bytes) -> Tuple[int, ...]:
+    return struct.unpack(SIGNATURE_FORMAT, data)
+
+async def _stored_candidates(db: AsyncSession, buckets: Set[int], quiz_id: int) -> Dict[int, List[Tuple[int, Tuple[int, ...]]]]:
+    ordered = sorted(buckets)
+    signatures: Dict[int, Tuple[int, Tuple[int, ...]]] = {}
+    found: Dict[int, List[Tuple[int, Tuple[int, ...]]]] = {}
+    for start in range(0, len(ordered), LOOKUP_CHUNK):
+        query = (
+            select(QuestionBand.bucket, QuestionSignature.question_id, QuestionSignature.quiz_id, QuestionSignature.signature)
+            .join(QuestionSignature, QuestionSignature.question_id == QuestionBand.question_id)
+            .where(QuestionBand.bucket.in_(ordered[start:start + LOOKUP_CHUNK]))
+        )
+        if settings.QUESTION_DEDUP_SCOPE == 'quiz':
+            query = query.where(QuestionSignature.quiz_id == quiz_id)
+        for bucket, question_id, owner, data in await db.execute(query):
+            if question_id not in signatures:
+                signatures[question_id] = (owner, unpack_signature(data))
+            found.setdefault(bucket, []).append(signatures[question_id])
+    return found
+
+async def deduplicate(
+    db: AsyncSession, quiz_id: int, questions: List[dict], keep_at_least: int = 0
+) -> List[Tuple[dict, Fingerprint]]:
+    fingerprints = await asyncio.to_thread(lambda: [fingerprint(q['question'], q['answer']) for q in questions])
+    if settings.QUESTION_DEDUP_SCOPE == 'off':
+        return list(zip(questions, fingerprints))
+    
+    threshold = settings.QUESTION_DEDUP_THRESHOLD
+    stored = await _stored_candidates(db, {bucket for fp in fingerprints for bucket in fp.buckets}, quiz_id)
+    batch: Dict[int, List[Tuple[int, ...]]] = {}
+    kept: List[Tuple[int, dict, Fingerprint]] = []
+    elsewhere: List[Tuple[int, dict, Fingerprint]] = []
+    for position, (question, fp) in enumerate(zip(questions, fingerprints)):
+        earlier = {signature for bucket in fp.buckets for signature in batch.get(bucket, ())}
+        if any(similarity(fp.signature, signature) >= threshold for signature in earlier):
+            QUESTIONS_DEDUPLICATED.inc(scope='batch')
+            continue
+        
+        candidates = {candidate for bucket in fp.buckets for candidate in stored.get(bucket, ())}
+        owners = {owner for owner, signature in candidates if similarity(fp.signature, signature) >= threshold}
+        if quiz_id in owners:
+            QUESTIONS_DEDUPLICATED.inc(scope='quiz')
+            continue
+        
+        for bucket in fp.buckets:
+            batch.setdefault(bucket, []).append(fp.signature)
+        (elsewhere if owners else kept).append((position, question, fp))
+    
+    restored = elsewhere[:max(0, keep_at_least - len(kept))]
+    QUESTIONS_DEDUPLICATED.inc(len(elsewhere) - len(restored), scope='other_quiz')
+    return [(question, fp) for _, question, fp in sorted(kept + restored, key=lambda item: item[0])]
+
+async def index_questions(db: AsyncSession, questions: List[Question], fingerprints: List[Fingerprint]):
+    if not questions:
+        return
+    await db.execute(insert(QuestionSignature), [
+        {'question_id': q.id, 'quiz_id': q.quiz_id, 'signature': pack_signature(fp.signature)}
+        for q, fp in zip(questions, fingerprints)
+    ])
+    await db.execute(insert(QuestionBand), [
+        {'bucket': bucket, 'question_id': q.id}
+        for q, fp in zip(questions, fingerprints)
+        for bucket in fp.buckets
+    ])
+
+async def remove_questions(db: AsyncSession, question_ids: List[int]):
+    await db.execute(delete(QuestionBand).where(QuestionBand.question_id.in_(question_ids)))
+    await db.execute(delete(QuestionSignature).where(QuestionSignature.question_id.in_(question_ids)))
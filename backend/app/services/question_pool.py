@@ -0,0 +1,74 @@
+import random
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+ANY_DIFFICULTY = 'any'
+
+class QuizVariant(NamedTuple):
+    num_questions: int
+    difficulty_mix: Optional[Dict[str, float]] = None
+    seed: Optional[int] = None
+    
+    @property
+    def is_default(self) -> bool:
+        return self.difficulty_mix is None and self.seed is None
+
+def normalize_difficulty(difficulty: Optional[str]) -> str:
+    difficulty = (difficulty or '').strip().lower()
+    return difficulty if difficulty in DIFFICULTIES else 'medium'
+
+def difficulty_counts(num_questions: int, mix: Dict[str, float]) -> Dict[str, int]:
+    weights = {difficulty: max(0.0, mix.get(difficulty, 0.0)) for difficulty in DIFFICULTIES}
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("The difficulty mix needs at least one positive weight.")
+    
+    exact = {difficulty: num_questions * weight / total for difficulty, weight in weights.items()}
+    counts = {difficulty: int(value) for difficulty, value in exact.items()}
+    remainders = sorted(DIFFICULTIES, key=lambda difficulty: exact[difficulty] - counts[difficulty], reverse=True)
+    for difficulty in remainders[:num_questions - sum(counts.values())]:
+        counts[difficulty] += 1
+    return counts
+
+def sample_questions(pool: Sequence[T], variant: QuizVariant, difficulty_of) -> Tuple[List[T], Dict[Optional[str], int]]:
+    rng = random.Random(variant.seed) if variant.seed is not None else None
+    
+    def pick(candidates: List[T], count: int) -> List[T]:
+        if rng is None:
+            return candidates[:count]
+        return rng.sample(candidates, min(count, len(candidates)))
+    
+    if variant.difficulty_mix is None:
+        selection = pick(list(pool), variant.num_questions)
+        shortfall = {None: variant.num_questions - len(selection)}
+    else:
+        buckets: Dict[str, List[T]] = {difficulty: [] for difficulty in DIFFICULTIES}
+        for question in pool:
+            buckets[normalize_difficulty(difficulty_of(question))].append(question)
+        selection = []
+        shortfall = {}
+        for difficulty, count in difficulty_counts(variant.num_questions, variant.difficulty_mix).items():
+            picked = pick(buckets[difficulty], count)
+            selection += picked
+            shortfall[difficulty] = count - len(picked)
+    
+    if rng is not None:
+        rng.shuffle(selection)
+    else:
+        order = {id(question): index for index, question in enumerate(pool)}
+        selection.sort(key=lambda question: order[id(question)])
+    return selection, {difficulty: missing for difficulty, missing in shortfall.items() if missing > 0}
+
+def exhausted_difficulties(shortfall: Dict[Optional[str], int], added: Sequence[T], difficulty_of) -> List[str]:
+    return [
+        difficulty or ANY_DIFFICULTY
+        for difficulty in shortfall
+        if not any(difficulty is None or normalize_difficulty(difficulty_of(question)) == difficulty for question in added)
+    ]
+
+def shuffled_options(options: List[str], seed: int, position: int) -> List[str]:
+    options = list(options)
+    random.Random(f"{seed}:{position}").shuffle(options)
+    return options
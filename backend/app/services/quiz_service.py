@@ -1,21 +1,103 @@
-from sqlalchemy.orm import Session
-from app.models.quiz import Quiz, Question
-from app.schemas.quiz import QuizCreate, QuizResponse, QuestionResponse, QuizHistoryItem
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from contextlib import nullcontext
+from sqlalchemy import and_, delete, func, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import QUESTION_POOL_TOPUPS, QUIZ_CACHE_LOOKUPS, QUIZ_REDIRECT_HITS, QUIZ_REFRESHED_QUESTIONS, QUIZ_REFRESHES, QUIZ_VARIANTS
+from app.core.timing import StageTimer
+from app.models.quiz import Quiz, Question, QuizPayload, ArticleAlias, GenerationClaim
+from app.schemas.quiz import QuizCreate, QuizResponse, QuestionResponse, QuizHistoryItem, QuizHistoryPage, QuizRefreshResponse, QuizSearchItem, QuizSearchPage
+from app.services.article_cache import article_cache
+from app.services.blob_store import discard_blob, load_html, store_blob
+from app.services.content_planner import render_sections, section_hashes, section_keys, section_name, split_sections
+from app.services.dump_source import get_dump_source
+from app.services.extractor import extract_article
+from app.services.payload_cache import PAYLOAD_CACHE_LOOKUPS, Payload, make_payload, payload_cache
+from app.services.question_index import deduplicate, index_questions, remove_questions
+from app.services.question_pool import ANY_DIFFICULTY, QuizVariant, difficulty_counts, exhausted_difficulties, sample_questions, shuffled_options
 from app.services.scraper import WikipediaScraper
-from app.services.llm_service import LLMService
-from typing import List, Optional
-from datetime import datetime
+from app.services.search_index import index_quiz, search
+from app.services.llm_service import RELATED_TOPICS_FALLBACKS, LLMService
+from app.services.llm_scheduler import INTERACTIVE
+from app.services.singleflight import SingleFlight
+from app.services.wikitext import convert_wikitext
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+generation_flights = SingleFlight()
 
 class QuizService:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: AsyncSession,
+        scrape_limit: Optional[asyncio.Semaphore] = None,
+        llm_limit: Optional[asyncio.Semaphore] = None,
+        on_event: Optional[Callable[[str, dict], None]] = None,
+        priority: int = INTERACTIVE,
+        source: str = 'web'
+    ):
         self.db = db
         self.scraper = WikipediaScraper()
-        self.llm_service = LLMService()
+        self._llm_service: Optional[LLMService] = None
+        self.scrape_limit = scrape_limit or nullcontext()
+        self.llm_limit = llm_limit or nullcontext()
+        self.on_event = on_event
+        self.priority = priority
+        self.source = source
+    
+    @property
+    def llm_service(self) -> LLMService:
+        if self._llm_service is None:
+            self._llm_service = LLMService(priority=self.priority)
+        return self._llm_service
+    
+    @property
+    def article_source(self):
+        if self.source == 'dump':
+            return get_dump_source()
+        return self.scraper
+    
+    def _emit_stage(self, stage: str):
+        if self.on_event:
+            self.on_event('stage', {'stage': stage})
     
-    def check_cached_quiz(self, url: str) -> Optional[Quiz]:
-        return self.db.query(Quiz).filter(Quiz.url == url).first()
+    def _pool_progress(self, pool_size: int) -> Optional[Callable[[dict], None]]:
+        if not self.on_event:
+            return None
+        drafted = itertools.count(1)
+        return lambda question: self.on_event('question', {'question': question, 'drafted': next(drafted), 'pool_size': pool_size})
     
-    def validate_url(self, url: str) -> dict:
+    async def check_cached_quiz(self, url: str, endpoint: str = 'generate') -> Optional[Quiz]:
+        key = self.scraper.article_key(url)
+        if key is None:
+            return None
+        quiz = await self._load_quiz(self.db, key)
+        QUIZ_CACHE_LOOKUPS.inc(endpoint=endpoint, result='hit' if quiz else 'miss')
+        return quiz
+    
+    async def _load_quiz(self, db: AsyncSession, key: str) -> Optional[Quiz]:
+        alias = select(ArticleAlias.article_key).where(ArticleAlias.alias_key == key).scalar_subquery()
+        result = await db.execute(
+            select(Quiz).options(selectinload(Quiz.questions))
+            .filter(or_(Quiz.article_key == key, Quiz.article_key == alias))
+        )
+        return result.scalars().first()
+    
+    async def _load_quiz_by_url(self, db: AsyncSession, url: str) -> Optional[Quiz]:
+        result = await db.execute(select(Quiz).options(selectinload(Quiz.questions)).filter(Quiz.url == url))
+        return result.scalars().first()
+    
+    async def validate_url(self, url: str) -> dict:
         if not self.scraper.validate_wikipedia_url(url):
             return {
                 'valid': False,
@@ -23,7 +105,7 @@ class QuizService:
                 'cached': False
             }
         
-        cached_quiz = self.check_cached_quiz(url)
+        cached_quiz = await self.check_cached_quiz(url, endpoint='validate')
         if cached_quiz:
             return {
                 'valid': True,
@@ -34,10 +116,10 @@ class QuizService:
             }
         
         try:
-            scraped_data = self.scraper.scrape_article(url)
+            article = await self._fetch_for_validation(url)
             return {
                 'valid': True,
-                'title': scraped_data['title'],
+                'title': article['title'],
                 'message': 'Valid Wikipedia article. Ready to generate quiz.',
                 'cached': False
             }
@@ -48,87 +130,563 @@ class QuizService:
                 'cached': False
             }
     
-    def generate_quiz(self, url: str, num_questions: int = 8) -> QuizResponse:
-        cached_quiz = self.check_cached_quiz(url)
-        if cached_quiz:
-            return self._quiz_to_response(cached_quiz)
+    async def _fetch_for_validation(self, url: str) -> dict:
+        key = self.scraper.article_key(url)
+        if settings.VALIDATION_MODE == 'metadata':
+            return await self.article_source.fetch_metadata(url)
         
-        scraped_data = self.scraper.scrape_article(url)
+        article = article_cache.get(self.source, key)
+        if article is None:
+            article = await self.article_source.scrape_article(url)
+            article_cache.put(self.source, key, article)
+        return article
+    
+    async def generate_quiz(
+        self,
+        url: str,
+        num_questions: Optional[int] = None,
+        difficulty_mix: Optional[Dict[str, float]] = None,
+        seed: Optional[int] = None
+    ) -> QuizResponse:
+        key = self.scraper.article_key(url)
+        if key is None:
+            raise ValueError("Invalid Wikipedia URL. Must be a valid English Wikipedia article URL.")
+        variant = QuizVariant(num_questions or settings.DEFAULT_QUIZ_SIZE, difficulty_mix, seed)
+        if not 1 <= variant.num_questions <= settings.MAX_QUIZ_SIZE:
+            raise ValueError(f"A quiz must have between 1 and {settings.MAX_QUIZ_SIZE} questions.")
+        if difficulty_mix is not None:
+            difficulty_counts(variant.num_questions, difficulty_mix)
         
-        quiz_questions = self.llm_service.generate_quiz(
-            title=scraped_data['title'],
-            content=scraped_data['content_text'],
-            sections=scraped_data['sections'],
-            num_questions=num_questions
-        )
+        cached_quiz = await self.check_cached_quiz(url)
+        if cached_quiz is None:
+            pool_size = max(settings.QUESTION_POOL_SIZE, variant.num_questions)
+            response = await generation_flights.do(key, lambda: self._generate_once(key, pool_size))
+            if variant.is_default and variant.num_questions == settings.DEFAULT_QUIZ_SIZE:
+                return response
+            cached_quiz = await self._load_quiz(self.db, key)
+            if cached_quiz is None:
+                return response
         
-        related_topics = self.llm_service.generate_related_topics(
-            title=scraped_data['title'],
-            content=scraped_data['content_text'],
-            sections=scraped_data['sections']
-        )
+        return await self._sample_variant(cached_quiz, variant)
+    
+    async def _sample_variant(self, quiz: Quiz, variant: QuizVariant) -> QuizResponse:
+        pool = sorted(quiz.questions, key=lambda q: q.id)
+        selection, shortfall = sample_questions(pool, variant, lambda q: q.difficulty)
+        exhausted = set(quiz.exhausted_difficulties or [])
+        wanted = {difficulty: missing for difficulty, missing in shortfall.items() if (difficulty or ANY_DIFFICULTY) not in exhausted}
+        if not wanted or len(pool) >= settings.QUESTION_POOL_MAX_SIZE:
+            QUIZ_VARIANTS.inc(result='short' if shortfall else 'pool')
+            return self._quiz_to_response(quiz, selection, variant.seed)
+        
+        key = f"pool:{quiz.id}:" + ",".join(sorted(f"{difficulty or ANY_DIFFICULTY}={missing}" for difficulty, missing in wanted.items()))
+        try:
+            pool = await generation_flights.do(key, lambda: self._top_up_pool(quiz.id, wanted, pool))
+        except Exception:
+            logger.warning("question pool top-up failed for quiz %s, serving the short pool", quiz.id, exc_info=True)
+            QUIZ_VARIANTS.inc(result='short')
+            return self._quiz_to_response(quiz, selection, variant.seed)
+        
+        QUIZ_VARIANTS.inc(result='topped_up')
+        selection, _ = sample_questions(pool, variant, lambda q: q.difficulty)
+        return self._quiz_to_response(quiz, selection, variant.seed)
+    
+    async def _top_up_pool(self, quiz_id: int, shortfall: Dict[Optional[str], int], pool: List[Question]) -> List[Question]:
+        timer = StageTimer("question_pool")
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(Quiz).options(selectinload(Quiz.questions)).filter(Quiz.id == quiz_id))
+            quiz = result.scalars().first()
+            if quiz is None:
+                return pool
+            article = article_cache.get(self.source, quiz.article_key) or await self._stored_article(db, quiz)
+            if article is None:
+                async with self.scrape_limit:
+                    article = await timer.run('scrape', self.article_source.scrape_article(quiz.url), settings.SCRAPE_TIMEOUT_SECONDS)
+            
+            async with self.llm_limit:
+                generated = await timer.run('llm_quiz', asyncio.gather(*(
+                    self.llm_service.generate_quiz(
+                        article['title'], article['content_text'], article['sections'], missing, difficulty=difficulty
+                    )
+                    for difficulty, missing in shortfall.items()
+                )), settings.QUIZ_TIMEOUT_SECONDS)
+            
+            additions = [q for questions in generated for q in questions]
+            
+            with timer.stage('db_commit'):
+                added = await self._insert_questions(db, quiz.id, additions, limit=settings.QUESTION_POOL_MAX_SIZE - len(quiz.questions))
+                pool = sorted(quiz.questions, key=lambda q: q.id) + added
+                exhausted = exhausted_difficulties(shortfall, added, lambda q: q.difficulty)
+                if exhausted:
+                    quiz.exhausted_difficulties = sorted(set(quiz.exhausted_difficulties or []) | set(exhausted))
+                payload = None
+                if added:
+                    set_committed_value(quiz, 'questions', pool)
+                    await index_quiz(db, quiz, [q.question_text for q in pool])
+                    payload = make_payload(self._quiz_to_response(quiz).model_dump_json().encode())
+                    await db.merge(QuizPayload(quiz_id=quiz.id, etag=payload.etag, body=payload.body, gzip_body=payload.gzip))
+                await db.commit()
+        if payload is not None:
+            payload_cache.put(quiz_id, payload)
+        QUESTION_POOL_TOPUPS.inc(len(added))
+        timer.log(quiz_id=quiz_id, added=len(added), exhausted=",".join(exhausted) or None)
+        return pool
+    
+    async def _generate_once(self, key: str, num_questions: int) -> QuizResponse:
+        owner = uuid.uuid4().hex
+        async with AsyncSessionLocal() as db:
+            while not await self._claim(db, key, owner):
+                quiz = await self._wait_for_claim(db, key)
+                if quiz:
+                    return self._quiz_to_response(quiz)
+            
+            try:
+                quiz = await self._load_quiz(db, key)
+                if quiz:
+                    return self._quiz_to_response(quiz)
+                return await self._generate_and_store(db, key, num_questions)
+            finally:
+                await db.rollback()
+                await db.execute(delete(GenerationClaim).where(GenerationClaim.key == key, GenerationClaim.owner == owner))
+                await db.commit()
+    
+    async def _claim(self, db: AsyncSession, key: str, owner: str) -> bool:
+        db.add(GenerationClaim(key=key, owner=owner, expires_at=time.time() + settings.GENERATION_CLAIM_TTL_SECONDS))
+        try:
+            await db.commit()
+            return True
+        except IntegrityError:
+            await db.rollback()
+            return False
+    
+    async def _wait_for_claim(self, db: AsyncSession, key: str) -> Optional[Quiz]:
+        while True:
+            await asyncio.sleep(settings.GENERATION_POLL_SECONDS)
+            quiz = await self._load_quiz(db, key)
+            if quiz:
+                return quiz
+            
+            result = await db.execute(select(GenerationClaim.expires_at).where(GenerationClaim.key == key))
+            expires_at = result.scalar()
+            if expires_at is None:
+                await db.rollback()
+                return None
+            if expires_at < time.time():
+                await db.execute(delete(GenerationClaim).where(GenerationClaim.key == key, GenerationClaim.expires_at == expires_at))
+                await db.commit()
+                return None
+            await db.rollback()
+    
+    async def _generate_and_store(self, db: AsyncSession, key: str, num_questions: int) -> QuizResponse:
+        timer = StageTimer("quiz_generation")
+        scraped_data = article_cache.get(self.source, key)
+        if scraped_data is None:
+            self._emit_stage('scraping')
+            async with self.scrape_limit:
+                scraped_data = await timer.run(
+                    'scrape', self.article_source.scrape_article(self.scraper.canonical_url(key)), settings.SCRAPE_TIMEOUT_SECONDS
+                )
+            article_cache.put(self.source, key, scraped_data)
+        
+        article_key = scraped_data['article_key']
+        if article_key != key:
+            await self._remember_alias(db, key, article_key)
+            existing = await self._load_quiz(db, article_key)
+            if existing:
+                QUIZ_REDIRECT_HITS.inc()
+                return self._quiz_to_response(existing)
+        
+        self._emit_stage('generating')
+        async with self.llm_limit:
+            quiz_questions, related_topics = await self._generate_content(scraped_data, num_questions, timer)
+        self._emit_stage('saving')
         
         quiz = Quiz(
-            url=url,
+            url=self.scraper.canonical_url(article_key),
+            article_key=article_key,
             title=scraped_data['title'],
             summary=scraped_data['summary'],
             key_entities=scraped_data['key_entities'],
             sections=scraped_data['sections'],
             related_topics=related_topics,
-            raw_html=scraped_data['raw_html']
+            raw_html_sha256=scraped_data['raw_html_blob']['sha256'],
+            revision_id=scraped_data.get('revision_id'),
+            etag=scraped_data.get('etag'),
+            last_modified=scraped_data.get('last_modified'),
+            section_hashes=section_hashes(scraped_data['content_text'])
         )
         
-        self.db.add(quiz)
-        self.db.flush()
-        
-        for q_data in quiz_questions:
-            question = Question(
-                quiz_id=quiz.id,
-                question_text=q_data['question'],
-                options=q_data['options'],
-                correct_answer=q_data['answer'],
-                difficulty=q_data['difficulty'],
-                explanation=q_data['explanation'],
-                section_reference=q_data.get('section_reference', 'General')
+        with timer.stage('db_commit'):
+            await store_blob(db, scraped_data['raw_html_blob'])
+            db.add(quiz)
+            try:
+                await db.flush()
+                questions = await self._insert_questions(db, quiz.id, quiz_questions, keep_at_least=settings.DEFAULT_QUIZ_SIZE)
+                set_committed_value(quiz, 'questions', questions)
+                await index_quiz(db, quiz, [q.question_text for q in questions])
+                response = self._quiz_to_response(quiz)
+                payload = make_payload(response.model_dump_json().encode())
+                db.add(QuizPayload(quiz_id=quiz.id, etag=payload.etag, body=payload.body, gzip_body=payload.gzip))
+                await db.commit()
+            except IntegrityError as e:
+                await db.rollback()
+                existing = await self._load_quiz(db, article_key) or await self._load_quiz_by_url(db, quiz.url)
+                if existing is None:
+                    raise RuntimeError(f"Could not store the quiz for {article_key}: it conflicts with another stored quiz.") from e
+                return self._quiz_to_response(existing)
+        payload_cache.put(quiz.id, payload)
+        article_cache.discard(self.source, key)
+        timer.log(article=article_key, mode=settings.LLM_MODE)
+        
+        return response
+    
+    async def _insert_questions(
+        self,
+        db: AsyncSession,
+        quiz_id: int,
+        quiz_questions: List[dict],
+        keep_at_least: int = 0,
+        limit: Optional[int] = None
+    ) -> List[Question]:
+        unique = (await deduplicate(db, quiz_id, quiz_questions, keep_at_least))[:limit]
+        if not unique:
+            return []
+        result = await db.scalars(
+            insert(Question).returning(Question, sort_by_parameter_order=True),
+            [
+                {
+                    'quiz_id': quiz_id,
+                    'question_text': q_data['question'],
+                    'options': q_data['options'],
+                    'correct_answer': q_data['answer'],
+                    'difficulty': q_data['difficulty'],
+                    'explanation': q_data['explanation'],
+                    'section_reference': q_data.get('section_reference', 'General')
+                }
+                for q_data, _ in unique
+            ]
+        )
+        questions = list(result.all())
+        await index_questions(db, questions, [fp for _, fp in unique])
+        return questions
+    
+    async def _remember_alias(self, db: AsyncSession, alias_key: str, article_key: str):
+        await db.merge(ArticleAlias(alias_key=alias_key, article_key=article_key))
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+    
+    async def _generate_content(self, scraped_data: dict, num_questions: int, timer: StageTimer) -> Tuple[List[dict], List[str]]:
+        title = scraped_data['title']
+        content = scraped_data['content_text']
+        sections = scraped_data['sections']
+        on_question = self._pool_progress(num_questions)
+        
+        if settings.LLM_MODE == 'combined':
+            return await timer.run(
+                'llm_combined',
+                self.llm_service.generate_quiz_and_topics(title, content, sections, num_questions, on_question),
+                settings.QUIZ_TIMEOUT_SECONDS
             )
-            self.db.add(question)
         
-        self.db.commit()
-        self.db.refresh(quiz)
+        topics_task = asyncio.create_task(timer.run(
+            'llm_topics',
+            self.llm_service.generate_related_topics(title, content, sections),
+            settings.TOPICS_TIMEOUT_SECONDS
+        ))
+        try:
+            quiz_questions = await timer.run(
+                'llm_quiz',
+                self.llm_service.generate_quiz(title, content, sections, num_questions, on_question),
+                settings.QUIZ_TIMEOUT_SECONDS
+            )
+        except BaseException:
+            topics_task.cancel()
+            raise
         
-        return self._quiz_to_response(quiz)
+        try:
+            related_topics = await topics_task
+        except TimeoutError:
+            RELATED_TOPICS_FALLBACKS.inc(reason='timeout')
+            related_topics = self.llm_service.fallback_topics(title)
+        
+        return quiz_questions, related_topics
+    
+    async def refresh_quiz(self, quiz_id: int) -> Optional[QuizRefreshResponse]:
+        result = await self.db.execute(select(Quiz.article_key, Quiz.url).where(Quiz.id == quiz_id))
+        row = result.first()
+        if row is None:
+            return None
+        key = row.article_key or self.scraper.article_key(row.url)
+        return await generation_flights.do(f"refresh:{key}", lambda: self._refresh_once(quiz_id, key))
+    
+    async def stale_quiz_ids(self, max_age_seconds: float, limit: int) -> List[int]:
+        last_checked = func.coalesce(Quiz.checked_at, Quiz.created_at)
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
+        result = await self.db.execute(
+            select(Quiz.id).where(last_checked < cutoff).order_by(last_checked).limit(limit)
+        )
+        return list(result.scalars())
+    
+    async def _refresh_once(self, quiz_id: int, key: str) -> QuizRefreshResponse:
+        owner = uuid.uuid4().hex
+        claim_key = f"refresh:{key}"
+        async with AsyncSessionLocal() as db:
+            if not await self._claim(db, claim_key, owner):
+                await db.execute(delete(GenerationClaim).where(GenerationClaim.key == claim_key, GenerationClaim.expires_at < time.time()))
+                await db.commit()
+                if not await self._claim(db, claim_key, owner):
+                    return QuizRefreshResponse(quiz_id=quiz_id, status='in_progress')
+            
+            try:
+                return await self._refresh_and_store(db, quiz_id, key)
+            finally:
+                await db.rollback()
+                await db.execute(delete(GenerationClaim).where(GenerationClaim.key == claim_key, GenerationClaim.owner == owner))
+                await db.commit()
+    
+    async def _refresh_and_store(self, db: AsyncSession, quiz_id: int, key: str) -> QuizRefreshResponse:
+        timer = StageTimer("quiz_refresh")
+        result = await db.execute(select(Quiz).options(selectinload(Quiz.questions)).filter(Quiz.id == quiz_id))
+        quiz = result.scalars().first()
+        if quiz is None:
+            raise ValueError("Quiz not found")
+        
+        async with self.scrape_limit:
+            article = await timer.run(
+                'scrape', self.article_source.refresh_article(quiz.url, quiz.etag, quiz.last_modified), settings.SCRAPE_TIMEOUT_SECONDS
+            )
+        if article is None or (article.get('revision_id') and article['revision_id'] == quiz.revision_id):
+            if article is not None:
+                quiz.etag = article.get('etag')
+                quiz.last_modified = article.get('last_modified')
+            quiz.checked_at = datetime.now(timezone.utc)
+            await db.commit()
+            QUIZ_REFRESHES.inc(result='not_modified')
+            return QuizRefreshResponse(quiz_id=quiz.id, status='not_modified', revision_id=quiz.revision_id)
+        
+        previous = quiz.section_hashes or await self._stored_section_hashes(db, quiz)
+        current = section_hashes(article['content_text'])
+        changed = [key for key, digest in current.items() if previous.get(key) != digest]
+        removed = [key for key in previous if key not in current]
+        stale_sections = {section_name(key) for key in changed + removed}
+        stale = [q for q in quiz.questions if q.section_reference in stale_sections]
+        kept = [q for q in quiz.questions if q.section_reference not in stale_sections]
+        
+        new_questions = []
+        if stale:
+            new_questions = await self._regenerate_questions(article, changed, len(stale), timer)
+        
+        with timer.stage('db_commit'):
+            await store_blob(db, article['raw_html_blob'])
+            superseded = quiz.raw_html_sha256
+            if stale:
+                await remove_questions(db, [q.id for q in stale])
+                await db.execute(delete(Question).where(Question.id.in_([q.id for q in stale])))
+            inserted = await self._insert_questions(
+                db, quiz.id, new_questions, keep_at_least=settings.DEFAULT_QUIZ_SIZE - len(kept)
+            )
+            set_committed_value(quiz, 'questions', kept + inserted)
+            quiz.title = article['title']
+            quiz.summary = article['summary']
+            quiz.key_entities = article['key_entities']
+            quiz.sections = article['sections']
+            quiz.raw_html_sha256 = article['raw_html_blob']['sha256']
+            quiz.revision_id = article.get('revision_id')
+            quiz.etag = article.get('etag')
+            quiz.last_modified = article.get('last_modified')
+            quiz.section_hashes = current
+            quiz.exhausted_difficulties = None
+            quiz.checked_at = datetime.now(timezone.utc)
+            if superseded and superseded != quiz.raw_html_sha256:
+                await db.flush()
+                await discard_blob(db, superseded)
+            await index_quiz(db, quiz, [q.question_text for q in quiz.questions])
+            response = self._quiz_to_response(quiz)
+            payload = make_payload(response.model_dump_json().encode())
+            await db.merge(QuizPayload(quiz_id=quiz.id, etag=payload.etag, body=payload.body, gzip_body=payload.gzip))
+            await db.commit()
+        payload_cache.put(quiz.id, payload)
+        article_cache.discard(self.source, key)
+        
+        status = 'updated' if stale_sections else 'unchanged'
+        QUIZ_REFRESHES.inc(result=status)
+        QUIZ_REFRESHED_QUESTIONS.inc(len(inserted))
+        timer.log(article=key, status=status, replaced=len(stale))
+        return QuizRefreshResponse(
+            quiz_id=quiz.id,
+            status=status,
+            revision_id=quiz.revision_id,
+            changed_sections=changed,
+            removed_sections=removed,
+            questions_replaced=len(stale)
+        )
+    
+    async def _regenerate_questions(self, article: dict, changed: List[str], count: int, timer: StageTimer) -> List[dict]:
+        split = split_sections(article['content_text'])
+        sections = [section for key, section in zip(section_keys(split), split) if key in changed]
+        if sections:
+            content = render_sections(sections, settings.CONTENT_TOKEN_BUDGET)
+            names = [section.name for section in sections]
+        else:
+            content = article['content_text']
+            names = article['sections']
+        
+        async with self.llm_limit:
+            return await timer.run(
+                'llm_quiz',
+                self.llm_service.generate_quiz(article['title'], content, names, count),
+                settings.QUIZ_TIMEOUT_SECONDS
+            )
+    
+    async def _stored_section_hashes(self, db: AsyncSession, quiz: Quiz) -> Dict[str, str]:
+        article = await self._stored_article(db, quiz)
+        return section_hashes(article['content_text']) if article else {}
+    
+    async def _stored_article(self, db: AsyncSession, quiz: Quiz) -> Optional[dict]:
+        raw = await load_html(db, quiz.raw_html_sha256) if quiz.raw_html_sha256 else None
+        if raw is None:
+            return None
+        if raw.lstrip()[:15].lower().startswith(('<!doctype', '<html')):
+            return await asyncio.to_thread(extract_article, raw.encode('utf-8'))
+        return convert_wikitext(quiz.title, raw)
     
-    def get_quiz_by_id(self, quiz_id: int) -> Optional[QuizResponse]:
-        quiz = self.db.query(Quiz).filter(Quiz.id == quiz_id).first()
+    async def get_quiz_by_id(self, quiz_id: int) -> Optional[QuizResponse]:
+        result = await self.db.execute(
+            select(Quiz).options(selectinload(Quiz.questions)).filter(Quiz.id == quiz_id)
+        )
+        quiz = result.scalars().first()
         if quiz:
             return self._quiz_to_response(quiz)
         return None
     
-    def get_all_quizzes(self) -> List[QuizHistoryItem]:
-        quizzes = self.db.query(Quiz).order_by(Quiz.created_at.desc()).all()
-        return [
-            QuizHistoryItem(
-                id=quiz.id,
-                url=quiz.url,
-                title=quiz.title,
-                created_at=quiz.created_at,
-                question_count=len(quiz.questions)
-            )
-            for quiz in quizzes
-        ]
+    async def get_quiz_payload(self, quiz_id: int) -> Optional[Payload]:
+        payload = payload_cache.get(quiz_id)
+        if payload is not None and not payload_cache.needs_revalidation(quiz_id):
+            PAYLOAD_CACHE_LOOKUPS.inc(source='memory')
+            return payload
+        if payload is not None:
+            result = await self.db.execute(select(QuizPayload.etag).where(QuizPayload.quiz_id == quiz_id))
+            if result.scalar() == payload.etag:
+                payload_cache.mark_valid(quiz_id)
+                PAYLOAD_CACHE_LOOKUPS.inc(source='revalidated')
+                return payload
+            payload_cache.discard(quiz_id)
+        
+        payload = await self._stored_payload(quiz_id)
+        if payload is not None:
+            PAYLOAD_CACHE_LOOKUPS.inc(source='database')
+        else:
+            response = await self.get_quiz_by_id(quiz_id)
+            if response is None:
+                return None
+            PAYLOAD_CACHE_LOOKUPS.inc(source='rebuilt')
+            payload = make_payload(response.model_dump_json().encode())
+            await self.db.merge(QuizPayload(quiz_id=quiz_id, etag=payload.etag, body=payload.body, gzip_body=payload.gzip))
+            try:
+                await self.db.commit()
+            except IntegrityError:
+                await self.db.rollback()
+                payload = await self._stored_payload(quiz_id) or payload
+        
+        payload_cache.put(quiz_id, payload)
+        return payload
+    
+    async def _stored_payload(self, quiz_id: int) -> Optional[Payload]:
+        result = await self.db.execute(
+            select(QuizPayload.body, QuizPayload.etag, QuizPayload.gzip_body).where(QuizPayload.quiz_id == quiz_id)
+        )
+        row = result.first()
+        return Payload(body=row.body, etag=row.etag, gzip=row.gzip_body) if row is not None else None
+    
+    async def get_raw_html(self, quiz_id: int) -> Optional[str]:
+        result = await self.db.execute(select(Quiz.raw_html_sha256).filter(Quiz.id == quiz_id))
+        sha256 = result.scalar()
+        if sha256 is None:
+            return None
+        return await load_html(self.db, sha256)
+    
+    async def get_all_quizzes(self, limit: int = 20, cursor: Optional[int] = None) -> QuizHistoryPage:
+        query = select(Quiz.id, Quiz.url, Quiz.title, Quiz.created_at)
+        if cursor is not None:
+            anchor = select(Quiz.created_at).where(Quiz.id == cursor).scalar_subquery()
+            query = query.where(or_(
+                Quiz.created_at < anchor,
+                and_(Quiz.created_at == anchor, Quiz.id < cursor)
+            ))
+        query = query.order_by(Quiz.created_at.desc(), Quiz.id.desc()).limit(limit + 1)
+        
+        rows = (await self.db.execute(query)).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        counts = await self._question_counts([row.id for row in rows])
+        
+        return QuizHistoryPage(
+            items=[
+                QuizHistoryItem(
+                    id=row.id,
+                    url=row.url,
+                    title=row.title,
+                    created_at=row.created_at,
+                    question_count=min(counts.get(row.id, 0), settings.DEFAULT_QUIZ_SIZE),
+                    pool_size=counts.get(row.id, 0)
+                )
+                for row in rows
+            ],
+            next_cursor=rows[-1].id if has_more else None
+        )
+    
+    async def search_quizzes(self, query: str, limit: int = 20, offset: int = 0) -> QuizSearchPage:
+        matches = await search(self.db, query, limit + 1, offset)
+        has_more = len(matches) > limit
+        matches = matches[:limit]
+        
+        ids = [quiz_id for quiz_id, _ in matches]
+        result = await self.db.execute(select(Quiz.id, Quiz.url, Quiz.title, Quiz.created_at).where(Quiz.id.in_(ids)))
+        rows = {row.id: row for row in result.all()}
+        counts = await self._question_counts(ids)
+        
+        return QuizSearchPage(
+            items=[
+                QuizSearchItem(
+                    id=quiz_id,
+                    url=rows[quiz_id].url,
+                    title=rows[quiz_id].title,
+                    created_at=rows[quiz_id].created_at,
+                    question_count=min(counts.get(quiz_id, 0), settings.DEFAULT_QUIZ_SIZE),
+                    pool_size=counts.get(quiz_id, 0),
+                    score=score
+                )
+                for quiz_id, score in matches
+                if quiz_id in rows
+            ],
+            next_offset=offset + limit if has_more else None
+        )
+    
+    async def _question_counts(self, quiz_ids: List[int]) -> Dict[int, int]:
+        if not quiz_ids:
+            return {}
+        result = await self.db.execute(
+            select(Question.quiz_id, func.count(Question.id))
+            .where(Question.quiz_id.in_(quiz_ids))
+            .group_by(Question.quiz_id)
+        )
+        return dict(result.all())
     
-    def _quiz_to_response(self, quiz: Quiz) -> QuizResponse:
+    def _quiz_to_response(self, quiz: Quiz, questions: Optional[List[Question]] = None, seed: Optional[int] = None) -> QuizResponse:
+        if questions is None:
+            questions = sorted(quiz.questions, key=lambda q: q.id)[:settings.DEFAULT_QUIZ_SIZE]
         questions = [
             QuestionResponse(
                 id=q.id,
                 question=q.question_text,
-                options=q.options,
+                options=shuffled_options(q.options, seed, q.id) if seed is not None else q.options,
                 answer=q.correct_answer,
                 difficulty=q.difficulty,
                 explanation=q.explanation,
                 section_reference=q.section_reference
             )
-            for q in quiz.questions
+            for q in questions
         ]
         
         return QuizResponse(
@@ -140,5 +698,6 @@ class QuizService:
             sections=quiz.sections,
             related_topics=quiz.related_topics,
             quiz=questions,
-            created_at=quiz.created_at
+            created_at=quiz.created_at,
+            seed=seed
         )
@@ -1,143 +1,119 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional
+import asyncio
+import httpx
+from typing import Dict, Optional
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+from app.core.clients import clients
+from app.core.metrics import Counter
+from app.core.timing import StageTimer
+from app.services.blob_store import pack_html
+from app.services.extractor import extract_article
 import re
 
+WIKI_HOST_PATTERN = re.compile(r'^(en\.)?(m\.)?wikipedia\.org$', re.IGNORECASE)
+REVISION_PATTERN = re.compile(rb'"wgRevisionId":(\d+)')
+SUMMARY_API_URL = "https://en.wikipedia.org/api/rest_v1/page/summary/"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+WIKIPEDIA_FETCHES = Counter(
+    "wikipedia_fetches_total",
+    "Upstream Wikipedia requests by kind (page, metadata)",
+    ("kind",)
+)
+
 class WikipediaScraper:
     
     @staticmethod
     def validate_wikipedia_url(url: str) -> bool:
-        pattern = r'^https?://(en\.)?wikipedia\.org/wiki/.+'
-        return bool(re.match(pattern, url))
+        return WikipediaScraper.article_key(url) is not None
     
     @staticmethod
-    def scrape_article(url: str) -> Dict:
-        if not WikipediaScraper.validate_wikipedia_url(url):
-            raise ValueError("Invalid Wikipedia URL. Must be a valid English Wikipedia article URL.")
+    def article_key(url: str) -> Optional[str]:
+        parts = urlsplit(url.strip())
+        if parts.scheme.lower() not in ('http', 'https') or not WIKI_HOST_PATTERN.match(parts.hostname or ''):
+            return None
         
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            title = WikipediaScraper._extract_title(soup)
-            summary = WikipediaScraper._extract_summary(soup)
-            sections = WikipediaScraper._extract_sections(soup)
-            key_entities = WikipediaScraper._extract_entities(soup)
-            content_text = WikipediaScraper._extract_full_text(soup)
-            
-            return {
-                'title': title,
-                'summary': summary,
-                'sections': sections,
-                'key_entities': key_entities,
-                'content_text': content_text,
-                'raw_html': str(soup)
-            }
-            
-        except requests.RequestException as e:
-            raise Exception(f"Failed to fetch Wikipedia article: {str(e)}")
+        if parts.path.startswith('/wiki/'):
+            title = unquote(parts.path[len('/wiki/'):])
+        elif parts.path == '/w/index.php':
+            title = parse_qs(parts.query).get('title', [''])[0]
+        else:
+            return None
+        
+        return WikipediaScraper.normalize_title(title)
     
     @staticmethod
-    def _extract_title(soup: BeautifulSoup) -> str:
-        title_elem = soup.find('h1', class_='firstHeading')
-        if title_elem:
-            return title_elem.get_text().strip()
-        title_elem = soup.find('title')
-        if title_elem:
-            return title_elem.get_text().replace(' - Wikipedia', '').strip()
-        return "Unknown Title"
+    def normalize_title(title: str) -> Optional[str]:
+        title = re.sub(r'[\s_]+', '_', title).strip('_')
+        if not title:
+            return None
+        return title[0].upper() + title[1:]
     
     @staticmethod
-    def _extract_summary(soup: BeautifulSoup) -> str:
-        content_div = soup.find('div', id='bodyContent')
-        if not content_div:
-            content_div = soup.find('div', class_='mw-parser-output')
-        if not content_div:
-            return ""
-        
-        paragraphs = []
-        for elem in content_div.find_all('p'):
-            text = elem.get_text().strip()
-            if text and len(text) > 50:
-                paragraphs.append(text)
-                if len(paragraphs) >= 3:
-                    break
-        
-        return ' '.join(paragraphs)
+    def canonical_url(key: str) -> str:
+        return f"https://en.wikipedia.org/wiki/{quote(key, safe='_()/:,!*~.-')}"
     
     @staticmethod
-    def _extract_sections(soup: BeautifulSoup) -> List[str]:
-        sections = []
-        content_div = soup.find('div', id='bodyContent')
-        if not content_div:
-            content_div = soup.find('div', class_='mw-parser-output')
-        
-        if content_div:
-            for heading in content_div.find_all(['h2', 'h3']):
-                headline = heading.find('span', class_='mw-headline')
-                if headline:
-                    section_text = headline.get_text().strip()
-                    if section_text and section_text not in ['Contents', 'References', 'External links', 'See also', 'Notes', 'Bibliography', 'Further reading']:
-                        sections.append(section_text)
-        return sections[:15]
+    async def scrape_article(url: str) -> Dict:
+        return await WikipediaScraper.refresh_article(url)
     
     @staticmethod
-    def _extract_entities(soup: BeautifulSoup) -> Dict[str, List[str]]:
-        people = set()
-        organizations = set()
-        locations = set()
+    async def refresh_article(url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Optional[Dict]:
+        key = WikipediaScraper.article_key(url)
+        if key is None:
+            raise ValueError("Invalid Wikipedia URL. Must be a valid English Wikipedia article URL.")
         
-        content_div = soup.find('div', id='bodyContent')
-        if not content_div:
-            content_div = soup.find('div', class_='mw-parser-output')
+        headers = dict(HEADERS)
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
         
-        if content_div:
-            for link in content_div.find_all('a', href=True, limit=150):
-                href = link.get('href', '')
-                text = link.get_text().strip()
-                
-                if '/wiki/' in href and ':' not in href and text and len(text) > 2:
-                    if any(word in href.lower() for word in ['university', 'institute', 'organization', 'company', 'corporation', 'laboratory']):
-                        organizations.add(text)
-                    elif any(word in href.lower() for word in ['city', 'country', 'state', 'kingdom', 'empire', 'united']):
-                        locations.add(text)
-                    elif len(text.split()) <= 3 and text[0].isupper() and not text.isupper():
-                        people.add(text)
+        timer = StageTimer("scrape")
+        try:
+            WIKIPEDIA_FETCHES.inc(kind='page')
+            with timer.stage('fetch'):
+                response = await clients.http.get(WikipediaScraper.canonical_url(key), headers=headers)
+                if response.status_code == 304:
+                    return None
+                response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to fetch Wikipedia article: {str(e)}")
         
-        return {
-            'people': list(people)[:15],
-            'organizations': list(organizations)[:15],
-            'locations': list(locations)[:15]
-        }
+        with timer.stage('parse'):
+            article = await asyncio.to_thread(WikipediaScraper.parse_article, response.content)
+        article['article_key'] = WikipediaScraper.article_key(article.pop('canonical_url') or '') or key
+        article['etag'] = response.headers.get('etag')
+        article['last_modified'] = response.headers.get('last-modified')
+        return article
     
     @staticmethod
-    def _extract_full_text(soup: BeautifulSoup) -> str:
-        content_div = soup.find('div', id='bodyContent')
-        if not content_div:
-            content_div = soup.find('div', class_='mw-parser-output')
-        if not content_div:
-            return ""
-        
-        for unwanted in content_div.find_all(['table', 'script', 'style', 'sup', 'div.navbox', 'div.reflist']):
-            unwanted.decompose()
-        
-        for unwanted in content_div.find_all('span', class_='mw-editsection'):
-            unwanted.decompose()
+    async def fetch_metadata(url: str) -> Dict:
+        key = WikipediaScraper.article_key(url)
+        if key is None:
+            raise ValueError("Invalid Wikipedia URL. Must be a valid English Wikipedia article URL.")
         
-        paragraphs = []
-        for elem in content_div.find_all(['p', 'h2', 'h3']):
-            text = elem.get_text().strip()
-            if text and len(text) > 30:
-                if elem.name in ['h2', 'h3']:
-                    headline = elem.find('span', class_='mw-headline')
-                    if headline:
-                        text = f"\n## {headline.get_text().strip()}\n"
-                paragraphs.append(text)
+        try:
+            WIKIPEDIA_FETCHES.inc(kind='metadata')
+            with StageTimer("scrape").stage('metadata'):
+                response = await clients.http.get(SUMMARY_API_URL + quote(key, safe=''), headers=HEADERS)
+            if response.status_code == 404:
+                raise Exception("Wikipedia article not found")
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to fetch Wikipedia article: {str(e)}")
         
-        full_text = '\n\n'.join(paragraphs)
-        return full_text[:15000] if full_text else ""
+        data = response.json()
+        return {
+            'title': data.get('title') or key.replace('_', ' '),
+            'article_key': data.get('titles', {}).get('canonical') or key
+        }
+    
+    @staticmethod
+    def parse_article(html: bytes) -> Dict:
+        article = extract_article(html)
+        revision = REVISION_PATTERN.search(html)
+        article['revision_id'] = revision.group(1).decode() if revision else None
+        article['raw_html_blob'] = pack_html(html)
+        return article
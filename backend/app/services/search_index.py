@@ -0,0 +1,88 @@
+import re
+from typing import Dict, List, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+MAX_TERMS = 16
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS quiz_search USING fts5("
+    "title, entities, sections, summary, questions, tokenize = 'porter unicode61')"
+]
+SQLITE_DELETE = "DELETE FROM quiz_search WHERE rowid = :quiz_id"
+SQLITE_INSERT = (
+    "INSERT INTO quiz_search (rowid, title, entities, sections, summary, questions) "
+    "VALUES (:quiz_id, :title, :entities, :sections, :summary, :questions)"
+)
+SQLITE_SEARCH = (
+    "SELECT rowid, -bm25(quiz_search, 10.0, 4.0, 3.0, 2.0, 1.0) AS score FROM quiz_search "
+    "WHERE quiz_search MATCH :query ORDER BY bm25(quiz_search, 10.0, 4.0, 3.0, 2.0, 1.0), rowid "
+    "LIMIT :limit OFFSET :offset"
+)
+
+POSTGRES_CREATE = [
+    "CREATE TABLE IF NOT EXISTS quiz_search ("
+    "quiz_id INTEGER PRIMARY KEY REFERENCES quizzes (id) ON DELETE CASCADE, document TSVECTOR NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_quiz_search_document ON quiz_search USING GIN (document)"
+]
+POSTGRES_UPSERT = (
+    "INSERT INTO quiz_search (quiz_id, document) VALUES (:quiz_id, "
+    "setweight(to_tsvector('english', :title), 'A') || "
+    "setweight(to_tsvector('english', :entities), 'B') || "
+    "setweight(to_tsvector('english', :sections), 'B') || "
+    "setweight(to_tsvector('english', :summary), 'C') || "
+    "setweight(to_tsvector('english', :questions), 'D')) "
+    "ON CONFLICT (quiz_id) DO UPDATE SET document = EXCLUDED.document"
+)
+POSTGRES_SEARCH = (
+    "SELECT quiz_id, ts_rank_cd(document, query) AS score FROM quiz_search, plainto_tsquery('english', :query) query "
+    "WHERE document @@ query ORDER BY score DESC, quiz_id LIMIT :limit OFFSET :offset"
+)
+
+def query_terms(query: str) -> List[str]:
+    terms = TERM_PATTERN.findall(query.lower())[:MAX_TERMS]
+    if not terms:
+        raise ValueError("The search query must contain at least one word.")
+    return terms
+
+def search_document(quiz, question_texts: List[str]) -> Dict[str, object]:
+    entities = quiz.key_entities or {}
+    return {
+        'quiz_id': quiz.id,
+        'title': quiz.title or '',
+        'entities': ' '.join(name for names in entities.values() for name in names),
+        'sections': ' '.join(quiz.sections or []),
+        'summary': quiz.summary or '',
+        'questions': ' '.join(question_texts)
+    }
+
+def create_search_index(conn: Connection):
+    statements = SQLITE_CREATE if conn.dialect.name == 'sqlite' else POSTGRES_CREATE
+    for statement in statements:
+        conn.execute(text(statement))
+
+def write_documents(conn: Connection, documents: List[Dict[str, object]]):
+    if not documents:
+        return
+    if conn.dialect.name == 'sqlite':
+        conn.execute(text(SQLITE_DELETE), [{'quiz_id': document['quiz_id']} for document in documents])
+        conn.execute(text(SQLITE_INSERT), documents)
+    else:
+        conn.execute(text(POSTGRES_UPSERT), documents)
+
+async def index_quiz(db: AsyncSession, quiz, question_texts: List[str]):
+    document = search_document(quiz, question_texts)
+    await db.run_sync(lambda session: write_documents(session.connection(), [document]))
+
+async def search(db: AsyncSession, query: str, limit: int, offset: int) -> List[Tuple[int, float]]:
+    terms = query_terms(query)
+    if db.get_bind().dialect.name == 'sqlite':
+        statement = SQLITE_SEARCH
+        expression = ' '.join('"' + term + '"' for term in terms)
+    else:
+        statement = POSTGRES_SEARCH
+        expression = ' '.join(terms)
+    result = await db.execute(text(statement), {'query': expression, 'limit': limit, 'offset': offset})
+    return [(quiz_id, float(score)) for quiz_id, score in result.all()]
@@ -0,0 +1,134 @@
+import html
+import re
+from typing import Dict, List
+from app.services.extractor import (
+    EXCLUDED_SECTIONS, MAX_CONTENT_CHARS, MAX_ENTITIES, MAX_LINKS, MAX_SECTIONS, MAX_SUMMARY_PARAGRAPHS, entity_kind
+)
+
+COMMENT_PATTERN = re.compile(r'<!--.*?-->', re.DOTALL)
+REF_PATTERN = re.compile(r'<ref[^>]*/>|<ref[^>]*>.*?</ref>', re.DOTALL | re.IGNORECASE)
+SKIPPED_BLOCK_PATTERN = re.compile(r'<(gallery|math|score|timeline|syntaxhighlight)[^>]*>.*?</\1>', re.DOTALL | re.IGNORECASE)
+TAG_PATTERN = re.compile(r'</?[a-zA-Z][^>]*>')
+MEDIA_LINK_PATTERN = re.compile(r'\[\[(?:File|Image|Category|Media):', re.IGNORECASE)
+LINK_PATTERN = re.compile(r'\[\[([^\[\]|]+)(?:\|([^\[\]]*))?\]\]')
+EXTERNAL_LINK_PATTERN = re.compile(r'\[(?:https?:)?//[^\s\]]+\s*([^\]]*)\]')
+HEADING_PATTERN = re.compile(r'^(={2,6})\s*(.+?)\s*\1\s*$')
+EMPHASIS_PATTERN = re.compile(r"'{2,}")
+LIST_PREFIXES = ('*', '#', ':', ';', '|', '!', '{', '}')
+
+def strip_nested(text: str, opening: str, closing: str) -> str:
+    parts = []
+    depth = 0
+    position = 0
+    pattern = re.compile(re.escape(opening) + '|' + re.escape(closing))
+    for match in pattern.finditer(text):
+        if match.group() == opening:
+            if depth == 0:
+                parts.append(text[position:match.start()])
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                position = match.end()
+    if depth == 0:
+        parts.append(text[position:])
+    return ''.join(parts)
+
+def strip_media_links(text: str) -> str:
+    parts = []
+    position = 0
+    for match in MEDIA_LINK_PATTERN.finditer(text):
+        if match.start() < position:
+            continue
+        depth = 0
+        index = match.start()
+        while index < len(text) - 1:
+            pair = text[index:index + 2]
+            if pair == '[[':
+                depth += 1
+                index += 2
+            elif pair == ']]':
+                depth -= 1
+                index += 2
+                if depth == 0:
+                    break
+            else:
+                index += 1
+        parts.append(text[position:match.start()])
+        position = index
+    parts.append(text[position:])
+    return ''.join(parts)
+
+class WikitextConverter:
+    def __init__(self):
+        self.links_seen = 0
+        self.entities: Dict[str, Dict[str, None]] = {'people': {}, 'organizations': {}, 'locations': {}}
+    
+    def convert(self, title: str, wikitext: str) -> Dict:
+        text = COMMENT_PATTERN.sub('', wikitext)
+        text = REF_PATTERN.sub('', text)
+        text = SKIPPED_BLOCK_PATTERN.sub('', text)
+        text = strip_nested(text, '{{', '}}')
+        text = strip_nested(text, '{|', '|}')
+        text = strip_media_links(text)
+        text = LINK_PATTERN.sub(self._replace_link, text)
+        text = EXTERNAL_LINK_PATTERN.sub(lambda m: m.group(1), text)
+        text = EMPHASIS_PATTERN.sub('', text)
+        text = TAG_PATTERN.sub('', text)
+        text = html.unescape(text)
+        
+        sections: List[str] = []
+        blocks: List[str] = []
+        summary: List[str] = []
+        paragraph: List[str] = []
+        excluded = False
+        
+        def finish_paragraph():
+            content = ' '.join(paragraph).strip()
+            paragraph.clear()
+            if excluded:
+                return
+            if len(content) > 30:
+                blocks.append(content)
+            if len(content) > 50 and len(summary) < MAX_SUMMARY_PARAGRAPHS:
+                summary.append(content)
+        
+        for line in text.splitlines():
+            line = line.strip()
+            heading = HEADING_PATTERN.match(line)
+            if heading:
+                finish_paragraph()
+                level = len(heading.group(1))
+                name = heading.group(2).strip()
+                if level == 2:
+                    excluded = name in EXCLUDED_SECTIONS
+                if level <= 3 and not excluded and name:
+                    sections.append(name)
+                    blocks.append(f"\n## {name}\n")
+            elif not line or line.startswith(LIST_PREFIXES):
+                finish_paragraph()
+            else:
+                paragraph.append(line)
+        finish_paragraph()
+        
+        content_text = '\n\n'.join(blocks)
+        return {
+            'title': title,
+            'summary': ' '.join(summary),
+            'sections': sections[:MAX_SECTIONS],
+            'key_entities': {kind: list(names)[:MAX_ENTITIES] for kind, names in self.entities.items()},
+            'content_text': content_text[:MAX_CONTENT_CHARS]
+        }
+    
+    def _replace_link(self, match) -> str:
+        target = match.group(1).strip()
+        label = (match.group(2) or target).strip()
+        if self.links_seen < MAX_LINKS:
+            self.links_seen += 1
+            kind = entity_kind('/wiki/' + target.replace(' ', '_'), label)
+            if kind:
+                self.entities[kind][label] = None
+        return label
+
+def convert_wikitext(title: str, wikitext: str) -> Dict:
+    return WikitextConverter().convert(title, wikitext)
@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+async def main(args):
+    from app.core.clients import clients
+    from app.core.database import AsyncSessionLocal, engine, init_db
+    from app.services.batch_runner import BatchRunner, get_job_status, parse_url_list, refresh_stale_quizzes
+    
+    await init_db()
+    if args.refresh_stale is not None:
+        results = await refresh_stale_quizzes(
+            args.refresh_stale * 3600, args.limit, args.scrape_concurrency, args.llm_concurrency, args.source
+        )
+        await clients.aclose()
+        await engine.dispose()
+        for result in results:
+            detail = result.error or f"{result.questions_replaced} questions replaced, changed: {', '.join(result.changed_sections) or '-'}"
+            print(f"Quiz {result.quiz_id}: {result.status} ({detail})")
+        print(f"Refreshed {len(results)} quizzes")
+        return 1 if any(result.status == 'failed' for result in results) else 0
+    
+    runner = BatchRunner(args.scrape_concurrency, args.llm_concurrency, args.source)
+    
+    if args.resume:
+        job_id = args.resume
+    else:
+        with open(args.url_file) as f:
+            urls = parse_url_list(f.read())
+        async with AsyncSessionLocal() as db:
+            job = await runner.create_job(db, urls)
+        job_id = job.id
+        print(f"Created batch job {job_id} with {len(urls)} URLs")
+    
+    await runner.run(job_id, retry_failed=args.retry_failed)
+    
+    async with AsyncSessionLocal() as db:
+        status = await get_job_status(db, job_id)
+    await clients.aclose()
+    await engine.dispose()
+    
+    print(f"Job {status.id}: {status.done} done, {status.failed} failed, {status.pending} pending of {status.total}")
+    if status.error:
+        print(f"Job {status.status}: {status.error}")
+    if status.elapsed_seconds:
+        print(f"Elapsed {status.elapsed_seconds:.1f}s, {status.quizzes_per_minute or 0:.1f} quizzes/min")
+    for failure in status.failures:
+        print(f"  FAILED {failure.url}: {failure.error}")
+    return 1 if status.failed or status.status != 'completed' else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate quizzes for a list of Wikipedia URLs.")
+    parser.add_argument("url_file", nargs="?", help="file containing Wikipedia URLs, e.g. ../sample_data/urls.txt")
+    parser.add_argument("--resume", type=int, metavar="JOB_ID", help="resume an interrupted batch job")
+    parser.add_argument("--retry-failed", action="store_true", help="also retry URLs that failed earlier")
+    parser.add_argument("--scrape-concurrency", type=int, help="concurrent scrapes (with --resume, defaults to the job's stored limit)")
+    parser.add_argument("--llm-concurrency", type=int, help="concurrent LLM generations (with --resume, defaults to the job's stored limit)")
+    parser.add_argument("--refresh-stale", type=float, metavar="HOURS", help="re-check quizzes not checked for this many hours instead of generating")
+    parser.add_argument("--limit", type=int, default=100, help="maximum number of quizzes to refresh with --refresh-stale")
+    parser.add_argument("--source", choices=["web", "dump"], default="web", help="fetch articles from wikipedia.org or the offline dump")
+    args = parser.parse_args()
+    if not args.url_file and not args.resume and args.refresh_stale is None:
+        parser.error("a URL file, --resume JOB_ID or --refresh-stale HOURS is required")
+    from app.core.config import settings
+    for flag, value in (("--scrape-concurrency", args.scrape_concurrency), ("--llm-concurrency", args.llm_concurrency)):
+        if value is not None and not 1 <= value <= settings.BATCH_MAX_CONCURRENCY:
+            parser.error(f"{flag} must be between 1 and {settings.BATCH_MAX_CONCURRENCY}")
+    sys.exit(asyncio.run(main(args)))
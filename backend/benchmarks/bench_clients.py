@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+import httpx
+from langchain_core.prompts import PromptTemplate
+from langchain_google_genai import ChatGoogleGenerativeAI
+from app.core.clients import PROMPT_BLOCK_PATTERN, PROMPTS_DIR, clients
+from app.core.config import settings
+from app.services.quiz_service import QuizService
+
+PAGE = b"<html><body>" + b"<p>benchmark paragraph</p>" * 2000 + b"</body></html>"
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+def legacy_service_setup():
+    ChatGoogleGenerativeAI(model="models/gemini-2.5-flash", google_api_key=settings.GOOGLE_API_KEY, temperature=0.7)
+    for path in PROMPTS_DIR.glob("*_prompt.md"):
+        PromptTemplate.from_template(PROMPT_BLOCK_PATTERN.search(path.read_text()).group(1))
+
+def shared_service_setup():
+    QuizService(None).llm_service
+    clients.prompt("quiz_generation")
+
+def time_sync(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+async def time_fetches(url: str, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
+            (await client.get(url)).raise_for_status()
+    per_client = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        (await clients.http.get(url)).raise_for_status()
+    shared = (time.perf_counter() - start) / rounds
+    await clients.aclose()
+    return per_client, shared
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-request client setup cost: fresh clients vs application-scoped clients.")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/wiki/Benchmark"
+
+    clients.warm()
+    legacy = time_sync(legacy_service_setup, args.rounds)
+    shared = time_sync(shared_service_setup, args.rounds)
+    per_client, pooled = asyncio.run(time_fetches(url, args.rounds))
+    server.shutdown()
+
+    print(f"{'':28}{'per request':>14}{'app-scoped':>14}")
+    print(f"{'LLM client + prompts':28}{legacy * 1000:>11.3f} ms{shared * 1000:>11.3f} ms")
+    print(f"{'HTTP fetch (local server)':28}{per_client * 1000:>11.3f} ms{pooled * 1000:>11.3f} ms")
+    print(f"saved per generate request: {(legacy - shared + per_client - pooled) * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from app.core.config import settings
+from app.services.content_planner import estimate_tokens, plan_content, plan_shards, split_sections
+from app.services.extractor import extract_article
+from benchmarks.fixtures import fetch_fixtures, load_fixtures
+
+def coverage(prompt_sections: int, total_sections: int) -> str:
+    return f"{prompt_sections}/{total_sections}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt tokens and section coverage per quiz: legacy truncation vs the content planner.")
+    parser.add_argument("--fetch", action="store_true", help="download the sample articles into benchmarks/fixtures first")
+    parser.add_argument("--questions", type=int, default=8)
+    args = parser.parse_args()
+
+    paths = fetch_fixtures() if args.fetch else load_fixtures()
+    print(f"{'article':32}{'tokens':>8}{'legacy':>16}{'planned':>16}{'calls':>7}")
+    for path in paths:
+        content = extract_article(path.read_bytes())['content_text']
+        total = len(split_sections(content))
+        legacy = content[:12000]
+
+        if estimate_tokens(content) > settings.MAP_REDUCE_THRESHOLD_TOKENS:
+            shards = plan_shards(content, args.questions, settings.MAP_REDUCE_MAX_SHARDS, settings.SHARD_TOKEN_BUDGET)
+            planned_tokens = sum(estimate_tokens(shard.content) for shard in shards)
+            planned_sections = sum(len(split_sections(shard.content)) for shard in shards)
+            calls = len(shards)
+        else:
+            planned = plan_content(content, settings.CONTENT_TOKEN_BUDGET)
+            planned_tokens = estimate_tokens(planned)
+            planned_sections = len(split_sections(planned))
+            calls = 1
+
+        print(
+            f"{path.stem[:32]:32}{estimate_tokens(content):>8}"
+            f"{estimate_tokens(legacy):>7} ({coverage(len(split_sections(legacy)), total):>6})"
+            f"{planned_tokens:>7} ({coverage(planned_sections, total):>6}){calls:>7}"
+        )
+
+if __name__ == "__main__":
+    main()
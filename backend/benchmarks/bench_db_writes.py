@@ -0,0 +1,152 @@
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+DB_DIR = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_DIR}/tuned.db")
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from sqlalchemy import event, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core.config import settings
+from app.core.database import ASYNC_DATABASE_URL, AsyncSessionLocal, Base, _count_query, engine, init_db
+from app.core.migrations import run_migrations
+from app.models.quiz import Quiz, Question
+from app.services.question_index import deduplicate, index_questions
+from app.services.quiz_service import QuizService
+
+class PerRowQuizService(QuizService):
+    async def _insert_questions(self, db, quiz_id, quiz_questions, keep_at_least=0, limit=None):
+        unique = (await deduplicate(db, quiz_id, quiz_questions, keep_at_least))[:limit]
+        questions = []
+        for q_data, _ in unique:
+            questions.append(await db.scalar(insert(Question).values(
+                quiz_id=quiz_id,
+                question_text=q_data['question'],
+                options=q_data['options'],
+                correct_answer=q_data['answer'],
+                difficulty=q_data['difficulty'],
+                explanation=q_data['explanation'],
+                section_reference=q_data.get('section_reference', 'General')
+            ).returning(Question)))
+        await index_questions(db, questions, [fp for _, fp in unique])
+        return questions
+
+def quiz_questions(label: str, quiz_id: int, count: int) -> list:
+    rng = random.Random(f"{label}:{quiz_id}")
+    return [
+        {
+            "question": "Which " + " ".join(f"{rng.getrandbits(32):08x}" for _ in range(6)) + "?", "options": ["a", "b", "c", "d"], "answer": "a",
+            "difficulty": rng.choice(("easy", "medium", "hard")), "explanation": "because " * 20, "section_reference": "Section"
+        }
+        for _ in range(count)
+    ]
+
+async def default_engine():
+    url = f"sqlite+aiosqlite:///{DB_DIR}/default.db" if ASYNC_DATABASE_URL.startswith("sqlite") else ASYNC_DATABASE_URL
+    plain = create_async_engine(url)
+    event.listen(plain.sync_engine, "before_cursor_execute", _count_query)
+    async with plain.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
+    return plain
+
+async def write_quiz(service: QuizService, sessions, label: str, quiz_id: int, questions: int) -> int:
+    async with sessions() as db:
+        quiz = Quiz(
+            url=f"https://en.wikipedia.org/wiki/{label}_{quiz_id}", article_key=f"{label}_{quiz_id}",
+            title=f"Article {quiz_id}", summary="summary " * 60, key_entities={"people": ["A"] * 10}, sections=[], related_topics=[]
+        )
+        db.add(quiz)
+        await db.flush()
+        stored = await service._insert_questions(db, quiz.id, quiz_questions(label, quiz_id, questions), keep_at_least=settings.DEFAULT_QUIZ_SIZE)
+        await db.commit()
+        return len(stored)
+
+async def run(label: str, sessions, service: QuizService, writers: int, readers: int, quizzes: int, questions: int) -> dict:
+    latencies, errors, reads, stored = [], [], [0], [0]
+    stop = asyncio.Event()
+
+    async def writer(index: int):
+        for n in range(quizzes):
+            start = time.perf_counter()
+            try:
+                stored[0] += await write_quiz(service, sessions, label, index * quizzes + n + 1, questions)
+            except OperationalError as e:
+                errors.append(str(e))
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    async def reader():
+        while not stop.is_set():
+            try:
+                async with sessions() as db:
+                    await QuizService(db).get_all_quizzes(limit=20)
+                reads[0] += 1
+            except OperationalError as e:
+                errors.append(str(e))
+
+    reader_tasks = [asyncio.create_task(reader()) for _ in range(readers)]
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(i) for i in range(writers)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await asyncio.gather(*reader_tasks)
+
+    latencies.sort()
+    return {
+        "quizzes_per_second": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0,
+        "reads_per_second": reads[0] / elapsed,
+        "questions": stored[0],
+        "errors": len(errors),
+    }
+
+def gain(results: dict, faster: tuple, slower: tuple, metric: str) -> float:
+    return results[faster][metric] / max(results[slower][metric], 1e-9)
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare concurrent quiz writes through the app's async engine: default vs tuned "
+                                                 "engine settings, and per-row vs bulk question inserts.")
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--quizzes", type=int, default=50, help="quizzes written per writer")
+    parser.add_argument("--questions", type=int, default=20)
+    args = parser.parse_args()
+
+    await init_db()
+    plain = await default_engine()
+    engines = {"default": lambda: AsyncSessionLocal(bind=plain), "tuned": AsyncSessionLocal}
+    services = {"per-row": PerRowQuizService(None), "bulk": QuizService(None)}
+
+    print(f"{'engine':<10}{'inserts':<10}{'quizzes/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'reads/s':>10}{'questions':>11}{'errors':>8}")
+    results = {}
+    for engine_name, sessions in engines.items():
+        for insert_name, service in services.items():
+            label = f"{engine_name}_{insert_name}"
+            r = results[engine_name, insert_name] = await run(label, sessions, service, args.writers, args.readers, args.quizzes, args.questions)
+            print(f"{engine_name:<10}{insert_name:<10}{r['quizzes_per_second']:>12.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+                  f"{r['reads_per_second']:>10.0f}{r['questions']:>11}{r['errors']:>8}")
+
+    print()
+    for insert_name in services:
+        print(f"engine settings, {insert_name} inserts: writes {gain(results, ('tuned', insert_name), ('default', insert_name), 'quizzes_per_second'):.2f}x, "
+              f"reads {gain(results, ('tuned', insert_name), ('default', insert_name), 'reads_per_second'):.2f}x")
+    for engine_name in engines:
+        print(f"bulk inserts, {engine_name} engine: writes {gain(results, (engine_name, 'bulk'), (engine_name, 'per-row'), 'quizzes_per_second'):.2f}x, "
+              f"reads {gain(results, (engine_name, 'bulk'), (engine_name, 'per-row'), 'reads_per_second'):.2f}x")
+    await plain.dispose()
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
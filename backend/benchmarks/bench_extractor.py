@@ -0,0 +1,93 @@
+import argparse
+import gc
+import subprocess
+import sys
+import time
+import tracemalloc
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.extractor import extract_article
+from benchmarks.fixtures import BACKEND_DIR, fetch_fixtures, load_fixtures
+
+LEGACY_SCRAPER = "app/services/scraper.py"
+
+def git(*args: str) -> str:
+    return subprocess.run(["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True, check=True).stdout
+
+def default_legacy_ref() -> str:
+    introduced = git("log", "--diff-filter=A", "--format=%H", "--", "app/services/extractor.py").split()
+    return f"{introduced[-1]}^" if introduced else "HEAD"
+
+def load_legacy_scraper(ref: str):
+    source = git("show", f"{ref}:./{LEGACY_SCRAPER}")
+    module = types.ModuleType("legacy_scraper")
+    try:
+        exec(compile(source, f"{ref}:{LEGACY_SCRAPER}", "exec"), module.__dict__)
+    except ImportError as e:
+        sys.exit(f"The legacy scraper needs {e.name}: pip install -r benchmarks/requirements.txt, or pass --no-legacy")
+    scraper = module.WikipediaScraper
+
+    def legacy_extract(html: bytes) -> dict:
+        soup = module.BeautifulSoup(html, 'html.parser')
+        return {
+            'title': scraper._extract_title(soup),
+            'summary': scraper._extract_summary(soup),
+            'sections': scraper._extract_sections(soup),
+            'key_entities': scraper._extract_entities(soup),
+            'content_text': scraper._extract_full_text(soup),
+            'raw_html': str(soup)
+        }
+
+    return legacy_extract
+
+def measure(func, html: bytes, repeat: int):
+    gc.collect()
+    start = time.process_time()
+    for _ in range(repeat):
+        func(html)
+    cpu = (time.process_time() - start) / repeat
+
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare article extraction CPU time and peak memory.")
+    parser.add_argument("--fetch", action="store_true", help="download the sample_data/urls.txt articles first")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-legacy", action="store_true", help="skip the BeautifulSoup baseline")
+    parser.add_argument("--legacy-ref", help="git revision whose scraper is the baseline (default: the commit before extractor.py was added)")
+    args = parser.parse_args()
+
+    legacy_extract = None
+    if not args.no_legacy:
+        ref = args.legacy_ref or default_legacy_ref()
+        legacy_extract = load_legacy_scraper(ref)
+        print(f"baseline: {LEGACY_SCRAPER} at {git('rev-parse', '--short', ref).strip()}")
+
+    paths = fetch_fixtures() if args.fetch else load_fixtures()
+    rows = []
+    for path in paths:
+        html = path.read_bytes()
+        row = [path.stem, len(html) / 1024, *measure(extract_article, html, args.repeat)]
+        if not args.no_legacy:
+            row.extend(measure(legacy_extract, html, args.repeat))
+        rows.append(row)
+
+    header = f"{'article':<32}{'KB':>8}{'cpu ms':>10}{'peak MB':>10}"
+    if not args.no_legacy:
+        header += f"{'legacy ms':>12}{'legacy MB':>12}{'speedup':>10}"
+    print(header)
+    for row in rows:
+        line = f"{row[0]:<32}{row[1]:>8.0f}{row[2] * 1000:>10.1f}{row[3] / 1e6:>10.2f}"
+        if not args.no_legacy:
+            line += f"{row[4] * 1000:>12.1f}{row[5] / 1e6:>12.2f}{row[4] / row[2]:>9.1f}x"
+        print(line)
+
+if __name__ == "__main__":
+    main()
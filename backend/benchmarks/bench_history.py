@@ -0,0 +1,81 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+DB_DIR = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_DIR}/history.db")
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from sqlalchemy import event, insert
+from app.core.database import AsyncSessionLocal, engine, init_db
+from app.models.quiz import Quiz, Question
+from app.services.quiz_service import QuizService
+
+async def populate(count: int, batch: int = 5000):
+    start = datetime(2024, 1, 1)
+    async with engine.begin() as conn:
+        for offset in range(0, count, batch):
+            ids = range(offset + 1, min(offset + batch, count) + 1)
+            await conn.execute(insert(Quiz), [
+                {
+                    "id": i, "url": f"https://en.wikipedia.org/wiki/Article_{i}", "article_key": f"Article_{i}",
+                    "title": f"Article {i}", "summary": "summary " * 50, "key_entities": {}, "sections": [],
+                    "related_topics": [], "created_at": start + timedelta(seconds=i // 3)
+                }
+                for i in ids
+            ])
+            await conn.execute(insert(Question), [
+                {
+                    "quiz_id": i, "question_text": f"Question {q}?", "options": ["a", "b", "c", "d"],
+                    "correct_answer": "a", "difficulty": "easy", "explanation": "because", "section_reference": "General"
+                }
+                for i in ids for q in range(8)
+            ])
+
+async def walk(pages: int, limit: int):
+    statements = []
+    listener = lambda *args: statements.append(1)
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    timings = []
+    cursor = None
+    async with AsyncSessionLocal() as db:
+        service = QuizService(db)
+        for _ in range(pages):
+            start = time.perf_counter()
+            page = await service.get_all_quizzes(limit=limit, cursor=cursor)
+            timings.append(time.perf_counter() - start)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+    event.remove(engine.sync_engine, "before_cursor_execute", listener)
+    return timings, len(statements)
+
+async def main():
+    parser = argparse.ArgumentParser(description="Time keyset-paginated history reads over a large quizzes table.")
+    parser.add_argument("--quizzes", type=int, default=100_000)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    await init_db()
+    start = time.perf_counter()
+    await populate(args.quizzes)
+    print(f"populated {args.quizzes} quizzes in {time.perf_counter() - start:.1f}s")
+
+    timings, statements = await walk(args.pages, args.limit)
+    print(f"pages read:        {len(timings)}")
+    print(f"first page:        {timings[0] * 1000:.2f} ms")
+    print(f"last page:         {timings[-1] * 1000:.2f} ms")
+    print(f"mean page:         {sum(timings) / len(timings) * 1000:.2f} ms")
+    print(f"queries per page:  {statements / len(timings):.1f}")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+DB_DIR = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_DIR}/pipeline.db")
+os.environ.setdefault("LLM_PROVIDER", "stub")
+
+import httpx
+from sqlalchemy import delete, event
+from app.core import timing
+from app.core.clients import clients
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine, init_db
+from app.models.quiz import ArticleAlias, Question, QuestionBand, QuestionSignature, Quiz, QuizPayload
+from app.services.article_cache import article_cache
+from app.services.llm_providers import StubLLM
+from app.services.payload_cache import payload_cache
+from app.services.quiz_service import QuizService
+from app.services.scraper import WikipediaScraper
+from benchmarks.fixtures import fetch_fixtures, load_fixtures
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baselines" / "pipeline.json"
+
+def fixture_transport(paths) -> httpx.MockTransport:
+    pages = {path.stem: path.read_bytes() for path in paths}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        key = WikipediaScraper.article_key(str(request.url))
+        if key not in pages:
+            return httpx.Response(404)
+        return httpx.Response(200, content=pages[key], headers={"Content-Type": "text/html"})
+
+    return httpx.MockTransport(handler)
+
+async def reset():
+    article_cache.clear()
+    payload_cache.clear()
+    async with AsyncSessionLocal() as db:
+        for model in (QuizPayload, QuestionBand, QuestionSignature, Question, Quiz, ArticleAlias):
+            await db.execute(delete(model))
+        await db.commit()
+
+async def generate_once(url: str, stages: list, trace_allocations: bool = False):
+    await reset()
+    statements = []
+    listener = lambda *args: statements.append(1)
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    if trace_allocations:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        async with AsyncSessionLocal() as db:
+            await QuizService(db).generate_quiz(url)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_allocations else 0
+    finally:
+        if trace_allocations:
+            tracemalloc.stop()
+        event.remove(engine.sync_engine, "before_cursor_execute", listener)
+    return elapsed, stages.pop() if stages else {}, peak, len(statements)
+
+async def run(paths, rounds: int):
+    stages = []
+    timing.listeners.append(lambda timer: stages.append(dict(timer.timings)))
+    results = {}
+    for path in paths:
+        url = WikipediaScraper.canonical_url(path.stem)
+        totals, per_stage = [], {}
+        for _ in range(rounds):
+            elapsed, timings, _, queries = await generate_once(url, stages)
+            totals.append(elapsed)
+            for stage, seconds in timings.items():
+                per_stage.setdefault(stage, []).append(seconds)
+        _, _, peak, _ = await generate_once(url, stages, trace_allocations=True)
+        results[path.stem] = {
+            "total_ms": statistics.median(totals) * 1000,
+            "stages_ms": {stage: statistics.median(values) * 1000 for stage, values in per_stage.items()},
+            "peak_kb": peak / 1024,
+            "queries": queries
+        }
+    return results
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        checks = [("total_ms", result["total_ms"], base["total_ms"]), ("peak_kb", result["peak_kb"], base["peak_kb"])]
+        checks += [(f"stage {stage}", value, base["stages_ms"].get(stage)) for stage, value in result["stages_ms"].items()]
+        for label, value, expected in checks:
+            if expected and value > expected * (1 + tolerance):
+                regressions.append(f"{name}: {label} {value:.1f} > {expected:.1f} (+{tolerance:.0%})")
+        if result["queries"] > base["queries"]:
+            regressions.append(f"{name}: queries {result['queries']} > {base['queries']}")
+    return regressions
+
+def report(results: dict):
+    stages = sorted({stage for result in results.values() for stage in result["stages_ms"]})
+    print(f"{'article':28}{'total ms':>10}" + "".join(f"{stage:>14}" for stage in stages) + f"{'peak KB':>10}{'queries':>9}")
+    for name, result in results.items():
+        cells = "".join(f"{result['stages_ms'].get(stage, 0):>14.1f}" for stage in stages)
+        print(f"{name[:28]:28}{result['total_ms']:>10.1f}{cells}{result['peak_kb']:>10.0f}{result['queries']:>9}")
+
+async def main():
+    parser = argparse.ArgumentParser(description="Time each stage of QuizService.generate_quiz on saved HTML fixtures with the stub LLM.")
+    parser.add_argument("--fetch", action="store_true", help="download the sample articles into benchmarks/fixtures first")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="stub LLM latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="stub LLM jitter in seconds")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write the results to {BASELINE_FILE.name}")
+    parser.add_argument("--check", action="store_true", help="exit non-zero when results regress against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown before a regression is reported")
+    args = parser.parse_args()
+
+    paths = fetch_fixtures() if args.fetch else load_fixtures()
+    clients._http = httpx.AsyncClient(transport=fixture_transport(paths))
+    clients._llm = StubLLM(settings.STUB_LLM_RECORDING, latency=args.latency, jitter=args.jitter, seed=settings.STUB_LLM_SEED)
+    await init_db()
+
+    results = await run(paths, args.rounds)
+    report(results)
+    await clients.aclose()
+    await engine.dispose()
+
+    if args.save_baseline:
+        BASELINE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_FILE.write_text(json.dumps(results, indent=2))
+        print(f"baseline written to {BASELINE_FILE}")
+    if args.check:
+        if not BASELINE_FILE.exists():
+            sys.exit(f"No baseline at {BASELINE_FILE}; run with --save-baseline first.")
+        regressions = compare(results, json.loads(BASELINE_FILE.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
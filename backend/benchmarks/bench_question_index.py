@@ -0,0 +1,88 @@
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.core.config import settings
+from app.services.question_index import BAND_ROWS, NUM_BANDS, NUM_PERMUTATIONS, band_buckets, minhash, similarity
+
+TEMPLATES = [
+    "What year did {a} {verb} the {b}?",
+    "Which of the following best describes the role of {a} in the {b}?",
+    "Who was responsible for the {b} that {a} {verb}?",
+    "According to the article, why did {a} {verb} the {b}?",
+    "In which city did {a} first {verb} the {b}?",
+    "What was the main consequence of the {b} for {a}?",
+    "Which organisation did {a} {verb} after the {b}?",
+    "What is the {b} named after {a} primarily known for?",
+]
+VERBS = "found design capture publish defeat discover reform build invade sign rule study translate abolish".split()
+NOUNS = ("treaty railway empire university cathedral revolution theorem manuscript expedition republic symphony "
+         "parliament observatory dynasty harbour telescope canal fortress academy constitution").split()
+NAMES = ("Turing Curie Newton Darwin Lovelace Napoleon Bismarck Tesla Gauss Euler Kepler Galileo Hypatia Avicenna "
+         "Confucius Cleopatra Charlemagne Magellan Mendel Pasteur Faraday Noether Ramanujan Copernicus").split()
+
+def entity(rng: random.Random) -> str:
+    return f"{rng.choice(NAMES)} {rng.choice(NAMES)}"
+
+def question(rng: random.Random) -> str:
+    text = rng.choice(TEMPLATES).format(a=entity(rng), b=f"{rng.choice(NOUNS)} of {rng.choice(NOUNS)}s", verb=rng.choice(VERBS))
+    return f"{text} {rng.randint(1000, 2024)} {rng.choice(NOUNS)}"
+
+def reworded(rng: random.Random, text: str, edits: int) -> str:
+    words = text.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = rng.choice(("the", "a", "exactly", "first", "later"))
+    return " ".join(words)
+
+def layouts(spec: str):
+    for item in spec.split(","):
+        bands, rows = (int(value) for value in item.split("x"))
+        if bands * rows > NUM_PERMUTATIONS:
+            raise SystemExit(f"{item} needs {bands * rows} permutations, signatures have {NUM_PERMUTATIONS}")
+        yield bands, rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Candidates touched per question-bank lookup and near-duplicate recall, per LSH band layout.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 8000])
+    parser.add_argument("--layouts", default=f"24x3,{NUM_BANDS}x{BAND_ROWS},12x6")
+    parser.add_argument("--probes", type=int, default=200)
+    parser.add_argument("--edits", type=int, default=2, help="words replaced to make each planted near-duplicate")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    start = time.perf_counter()
+    bank = [minhash(question(rng)) for _ in range(max(args.sizes))]
+    originals = [question(rng) for _ in range(args.probes)]
+    duplicates = [(minhash(text), minhash(reworded(rng, text, args.edits))) for text in originals]
+    duplicates = [(a, b) for a, b in duplicates if similarity(a, b) >= settings.QUESTION_DEDUP_THRESHOLD]
+    probes = [minhash(question(rng)) for _ in range(args.probes)]
+    print(f"fingerprinted {len(bank) + 3 * args.probes} questions in {time.perf_counter() - start:.1f}s, "
+          f"threshold {settings.QUESTION_DEDUP_THRESHOLD}, {len(duplicates)} planted near-duplicates above it")
+    print(f"{'layout':>8}{'bank':>8}{'candidates/lookup':>19}{'false candidates':>18}{'recall':>8}")
+
+    for bands, rows in dict.fromkeys(layouts(args.layouts)):
+        index = {}
+        indexed = 0
+        recall = sum(bool(set(band_buckets(a, bands, rows)) & set(band_buckets(b, bands, rows))) for a, b in duplicates) / len(duplicates)
+        probe_buckets = [band_buckets(signature, bands, rows) for signature in probes]
+        for size in sorted(args.sizes):
+            for position in range(indexed, size):
+                for bucket in band_buckets(bank[position], bands, rows):
+                    index.setdefault(bucket, []).append(position)
+            indexed = size
+            touched = []
+            false = 0
+            for signature, buckets in zip(probes, probe_buckets):
+                candidates = {position for bucket in buckets for position in index.get(bucket, ())}
+                touched.append(len(candidates))
+                false += sum(similarity(signature, bank[position]) < settings.QUESTION_DEDUP_THRESHOLD for position in candidates)
+            print(f"{bands:>5}x{rows:<2}{size:>8}{sum(touched) / len(touched):>19.1f}{false / len(touched):>18.1f}{recall:>8.0%}")
+
+if __name__ == "__main__":
+    main()
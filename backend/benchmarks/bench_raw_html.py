@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/raw_html.db")
+
+from app.services.blob_store import pack_html
+from benchmarks.fixtures import FIXTURES_DIR
+
+WORDS = "the of and in to was a is for as with by on his that at from he which university war computer machine".split()
+
+def synthetic_page(rng: random.Random) -> bytes:
+    parts = ['<html><head><title>Article - Wikipedia</title></head><body><div id="bodyContent">']
+    for section in range(20):
+        parts.append(f'<h2><span class="mw-headline">Section {section}</span></h2>')
+        for _ in range(12):
+            words = " ".join(rng.choice(WORDS) for _ in range(120))
+            parts.append(f'<p>{words}<sup class="reference"><a href="#cite_note-{rng.randint(1, 500)}">[1]</a></sup></p>')
+    parts.append('</div></body></html>')
+    return "".join(parts).encode()
+
+def load_pages(count: int):
+    rng = random.Random(42)
+    fixtures = sorted(FIXTURES_DIR.glob("*.html"))
+    if fixtures:
+        pages = [path.read_bytes() for path in fixtures]
+        return [pages[i % len(pages)] + f"<!-- {i} -->".encode() for i in range(count)]
+    return [synthetic_page(rng) for _ in range(count)]
+
+QUIZ_COLUMNS = "id INTEGER PRIMARY KEY, url TEXT UNIQUE, title TEXT, summary TEXT, key_entities TEXT, sections TEXT, related_topics TEXT, created_at TEXT"
+
+def build(path: str, pages, inline: bool):
+    conn = sqlite3.connect(path)
+    if inline:
+        conn.execute(f"CREATE TABLE quizzes ({QUIZ_COLUMNS}, raw_html TEXT)")
+    else:
+        conn.execute("CREATE TABLE article_blobs (sha256 TEXT PRIMARY KEY, encoding TEXT, size INTEGER, data BLOB)")
+        conn.execute(f"CREATE TABLE quizzes ({QUIZ_COLUMNS}, raw_html_sha256 TEXT)")
+    conn.execute("CREATE TABLE questions (id INTEGER PRIMARY KEY, quiz_id INTEGER, question_text TEXT, options TEXT, correct_answer TEXT, difficulty TEXT, explanation TEXT, section_reference TEXT)")
+    conn.execute("CREATE INDEX ix_questions_quiz_id ON questions (quiz_id)")
+
+    for i, page in enumerate(pages, start=1):
+        row = (i, f"https://en.wikipedia.org/wiki/Article_{i}", f"Article {i}", "summary " * 60,
+               json.dumps({"people": ["A"] * 10}), json.dumps(["Section"] * 12), json.dumps(["Topic"] * 6), "2026-01-01")
+        if inline:
+            conn.execute("INSERT INTO quizzes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row + (page.decode(),))
+        else:
+            blob = pack_html(page)
+            conn.execute("INSERT OR IGNORE INTO article_blobs VALUES (?, 'zlib', ?, ?)", (blob['sha256'], blob['size'], blob['data']))
+            conn.execute("INSERT INTO quizzes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row + (blob['sha256'],))
+        for q in range(8):
+            conn.execute("INSERT INTO questions (quiz_id, question_text, options, correct_answer, difficulty, explanation, section_reference) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (i, f"Question {q}?", json.dumps(["a", "b", "c", "d"]), "a", "easy", "because " * 20, "Section"))
+    conn.commit()
+    return conn
+
+def timed(conn, sql, params=(), repeat=20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        conn.execute(sql, params).fetchall()
+    return (time.perf_counter() - start) / repeat
+
+def report(label: str, path: str, conn, count: int):
+    history = timed(conn, "SELECT * FROM quizzes ORDER BY created_at DESC")
+    detail = timed(conn, "SELECT * FROM quizzes WHERE id = ?", (count // 2,), repeat=200)
+    detail += timed(conn, "SELECT * FROM questions WHERE quiz_id = ?", (count // 2,), repeat=200)
+    size = os.path.getsize(path) / 1e6
+    print(f"{label:<10}{size:>12.1f}{history * 1000:>14.1f}{detail * 1000:>14.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare quizzes table layouts with inline vs blob-stored raw HTML.")
+    parser.add_argument("--quizzes", type=int, default=300)
+    args = parser.parse_args()
+
+    pages = load_pages(args.quizzes)
+    with tempfile.TemporaryDirectory() as tmp:
+        before_path, after_path = os.path.join(tmp, "before.db"), os.path.join(tmp, "after.db")
+        before = build(before_path, pages, inline=True)
+        after = build(after_path, pages, inline=False)
+        print(f"{args.quizzes} quizzes, {sum(map(len, pages)) / len(pages) / 1024:.0f} KB average page")
+        print(f"{'layout':<10}{'db MB':>12}{'history ms':>14}{'detail ms':>14}")
+        report("inline", before_path, before, args.quizzes)
+        report("blob", after_path, after, args.quizzes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.search_index import SQLITE_CREATE, SQLITE_INSERT, SQLITE_SEARCH, query_terms, search_document
+
+WORDS = ("history war computer machine university science theory city river empire music painting physics "
+         "language election army bridge railway novel poet king queen church island mountain treaty").split()
+NEEDLES = ["zephyrine", "quillometer", "brackenford"]
+NEEDLE_DOCUMENTS = 25
+
+def synthetic_quiz(rng: random.Random, quiz_id: int, needle: str = ""):
+    words = lambda count: " ".join(rng.choice(WORDS) for _ in range(count))
+    quiz = SimpleNamespace(
+        id=quiz_id,
+        title=f"{words(3).title()} {quiz_id} {needle}".strip(),
+        summary=words(80),
+        key_entities={"people": [words(2).title() for _ in range(5)], "locations": [words(1).title() for _ in range(3)]},
+        sections=[words(2).title() for _ in range(10)]
+    )
+    return search_document(quiz, [f"What {words(6)}?" for _ in range(20)])
+
+def grow(conn, rng: random.Random, start: int, end: int):
+    needle_ids = set(rng.sample(range(start + 1, end + 1), min(NEEDLE_DOCUMENTS, end - start))) if start == 0 else set()
+    batch = []
+    for quiz_id in range(start + 1, end + 1):
+        needle = " ".join(NEEDLES) if quiz_id in needle_ids else ""
+        batch.append(synthetic_quiz(rng, quiz_id, needle))
+        if len(batch) >= 1000:
+            conn.executemany(SQLITE_INSERT, batch)
+            batch = []
+    conn.executemany(SQLITE_INSERT, batch)
+    conn.commit()
+
+def timed(conn, sql: str, params: dict, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def fts_params(query: str, limit: int) -> dict:
+    return {"query": " ".join('"' + term + '"' for term in query_terms(query)), "limit": limit, "offset": 0}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure FTS5 quiz search latency as the indexed corpus grows.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--max-growth", type=float, default=3.0, help="fail if selective-query latency grows more than this")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "search.db")
+    conn = sqlite3.connect(path)
+    for statement in SQLITE_CREATE:
+        conn.execute(statement)
+    rng = random.Random(42)
+
+    selective = " ".join(NEEDLES[:2])
+    broad = f"{WORDS[0]} {WORDS[1]}"
+    print(f"{'quizzes':>10}{'index MB':>10}{'insert/s':>10}{'selective ms':>14}{'broad ms':>10}{'LIKE scan ms':>14}")
+    baseline = None
+    latency = 0.0
+    size = 0
+    for target in sorted(args.sizes):
+        start = time.perf_counter()
+        grow(conn, rng, size, target)
+        rate = (target - size) / (time.perf_counter() - start)
+        size = target
+        latency = timed(conn, SQLITE_SEARCH, fts_params(selective, args.limit), args.repeat)
+        broad_latency = timed(conn, SQLITE_SEARCH, fts_params(broad, args.limit), max(1, args.repeat // 10))
+        scan = timed(conn, "SELECT rowid FROM quiz_search WHERE questions LIKE :pattern LIMIT :limit",
+                     {"pattern": f"%{NEEDLES[0]}%", "limit": args.limit}, 3)
+        baseline = baseline or latency
+        print(f"{size:>10}{os.path.getsize(path) / 1e6:>10.1f}{rate:>10.0f}{latency * 1000:>14.3f}"
+              f"{broad_latency * 1000:>10.1f}{scan * 1000:>14.1f}")
+
+    if latency > baseline * args.max_growth:
+        print(f"OVER BUDGET selective query latency grew {latency / baseline:.1f}x (max {args.max_growth:.1f}x)")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
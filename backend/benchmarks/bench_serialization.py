@@ -0,0 +1,66 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from app.core.compression import brotli, compress
+from app.schemas.quiz import QuizResponse
+from app.services.payload_cache import PayloadCache, make_payload
+
+SAMPLE = Path(__file__).resolve().parent.parent.parent / "sample_data" / "sample_output_alan_turing.json"
+
+def sample_quiz(questions: int) -> QuizResponse:
+    data = json.loads(SAMPLE.read_text())
+    base = data["quiz"]
+    data["quiz"] = [dict(base[i % len(base)], id=i + 1) for i in range(questions)]
+    data.setdefault("id", 1)
+    data.setdefault("created_at", "2026-01-01T00:00:00Z")
+    return QuizResponse.model_validate(data)
+
+def cpu_per_call(fn, rounds: int) -> float:
+    fn()
+    start = time.process_time()
+    for _ in range(rounds):
+        fn()
+    return (time.process_time() - start) / rounds * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure quiz payload size and per-request serialization/compression CPU.")
+    parser.add_argument("--questions", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    quiz = sample_quiz(args.questions)
+    adapter = TypeAdapter(QuizResponse)
+    body = adapter.dump_json(quiz)
+    cache = PayloadCache(max_bytes=1 << 30)
+    cache.put(quiz.id, make_payload(body))
+
+    paths = [
+        ("jsonable_encoder + json.dumps (before)", lambda: JSONResponse(jsonable_encoder(quiz)).body),
+        ("pydantic dump_json", lambda: adapter.dump_json(quiz)),
+        ("dump_json + gzip", lambda: compress(adapter.dump_json(quiz), "gzip")),
+    ]
+    if brotli is not None:
+        paths.append(("dump_json + br", lambda: compress(adapter.dump_json(quiz), "br")))
+    paths.append(("stored gzip payload", lambda: cache.get(quiz.id).gzip))
+
+    print(f"quiz with {args.questions} questions")
+    print(f"  identity {len(body):>7} bytes")
+    print(f"  gzip     {len(compress(body, 'gzip')):>7} bytes")
+    if brotli is not None:
+        print(f"  br       {len(compress(body, 'br')):>7} bytes")
+    print(f"{'path':<42}{'CPU us/request':>16}")
+    for name, fn in paths:
+        print(f"{name:<42}{cpu_per_call(fn, args.rounds):>16.1f}")
+
+if __name__ == "__main__":
+    main()
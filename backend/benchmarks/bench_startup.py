@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+LAZY_MODULES = ("langchain_core", "langchain_google_genai", "google.genai", "google.generativeai")
+IMPORT_BUDGET_MS = 1500.0
+STARTUP_BUDGET_MS = 250.0
+
+def child():
+    start = time.perf_counter()
+    from app.main import app
+    imported = time.perf_counter()
+
+    async def startup():
+        async with app.router.lifespan_context(app):
+            return time.perf_counter()
+
+    ready = asyncio.run(startup())
+    print(json.dumps({
+        "import_ms": (imported - start) * 1000,
+        "startup_ms": (ready - imported) * 1000,
+        "lazy_modules_loaded": sorted(name for name in sys.modules if name.startswith(LAZY_MODULES))
+    }))
+
+def child_env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/startup.db")
+    env.setdefault("MIGRATE_ON_STARTUP", "false")
+    env.setdefault("CLIENT_WARMUP", "lazy")
+    return env
+
+def run_child(env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--child"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def slowest_imports(env: dict, count: int) -> list:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and name.startswith("   ") and not name.startswith("    "):
+            rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure cold import and startup time of app.main in fresh interpreters.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--max-startup-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10, help="show the slowest top-level imports")
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return 0
+
+    env = child_env()
+    runs = [run_child(env) for _ in range(args.rounds)]
+    import_ms = statistics.median(run["import_ms"] for run in runs)
+    startup_ms = statistics.median(run["startup_ms"] for run in runs)
+    loaded = sorted({name for run in runs for name in run["lazy_modules_loaded"]})
+
+    print(f"import app.main  {import_ms:8.1f} ms  (budget {args.max_import_ms:.0f})")
+    print(f"lifespan startup {startup_ms:8.1f} ms  (budget {args.max_startup_ms:.0f})")
+    if args.top:
+        print("slowest top-level imports:")
+        for cumulative, name in slowest_imports(env, args.top):
+            print(f"  {cumulative:8.1f} ms  {name}")
+
+    failures = []
+    if import_ms > args.max_import_ms:
+        failures.append(f"import took {import_ms:.1f} ms")
+    if startup_ms > args.max_startup_ms:
+        failures.append(f"startup took {startup_ms:.1f} ms")
+    if loaded:
+        failures.append(f"LLM modules imported at startup: {', '.join(loaded[:5])}")
+    for failure in failures:
+        print(f"OVER BUDGET {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(BACKEND_DIR))
+    sys.exit(main())
@@ -0,0 +1,34 @@
+import re
+import sys
+from pathlib import Path
+from typing import List
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = BACKEND_DIR / "benchmarks" / "fixtures"
+URLS_FILE = BACKEND_DIR.parent / "sample_data" / "urls.txt"
+
+def sample_urls() -> List[str]:
+    return re.findall(r'https?://\S+', URLS_FILE.read_text())
+
+def fixture_path(url: str) -> Path:
+    return FIXTURES_DIR / (url.rstrip('/').rsplit('/', 1)[-1] + ".html")
+
+def fetch_fixtures() -> List[Path]:
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    paths = []
+    with httpx.Client(headers={'User-Agent': 'wiki-quiz-benchmark'}, timeout=30, follow_redirects=True) as client:
+        for url in sample_urls():
+            path = fixture_path(url)
+            if not path.exists():
+                response = client.get(url)
+                response.raise_for_status()
+                path.write_bytes(response.content)
+            paths.append(path)
+    return paths
+
+def load_fixtures() -> List[Path]:
+    paths = sorted(FIXTURES_DIR.glob("*.html"))
+    if not paths:
+        sys.exit(f"No HTML fixtures in {FIXTURES_DIR}. Run with --fetch to download the sample articles.")
+    return paths
@@ -0,0 +1,21 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def main(args):
+    from app.services.dump_source import build_index
+    
+    start = time.perf_counter()
+    count = build_index(args.dump, args.out, args.multistream_index)
+    print(f"Indexed {count} titles from {args.dump} into {args.out} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the title -> stream offset index for an offline Wikipedia dump.")
+    parser.add_argument("dump", help="pages-articles-multistream XML .bz2 dump")
+    parser.add_argument("out", help="index file to write, e.g. enwiki-index.sqlite3")
+    parser.add_argument("--multistream-index", help="the dump's multistream-index.txt(.bz2); the dump is scanned when omitted")
+    sys.exit(main(parser.parse_args()))
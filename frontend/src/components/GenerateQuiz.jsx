@@ -12,6 +12,8 @@ function GenerateQuiz() {
   const [quiz, setQuiz] = useState(null);
   const [error, setError] = useState(null);
   const [mode, setMode] = useState('view');
+  const [stage, setStage] = useState(null);
+  const [streamedQuestions, setStreamedQuestions] = useState([]);
 
   const handleValidateUrl = async () => {
     if (!url.trim()) {
@@ -47,18 +49,30 @@ function GenerateQuiz() {
 
     setLoading(true);
     setError(null);
+    setStage(null);
+    setStreamedQuestions([]);
 
     try {
-      const result = await quizAPI.generateQuiz(url);
+      const result = await quizAPI.streamQuiz(url, {
+        onStage: setStage,
+        onQuestion: (progress) => setStreamedQuestions((questions) => [...questions, progress]),
+      });
       setQuiz(result);
       setMode('view');
     } catch (err) {
-      setError(err.response?.data?.detail || 'Failed to generate quiz');
+      setError(err.response?.data?.detail || err.message || 'Failed to generate quiz');
     } finally {
       setLoading(false);
     }
   };
 
+  const stageLabels = {
+    started: 'Starting...',
+    scraping: 'Reading the article...',
+    generating: 'Writing questions...',
+    saving: 'Saving quiz...',
+  };
+
   const handleReset = () => {
     setUrl('');
     setQuiz(null);
@@ -151,7 +165,7 @@ function GenerateQuiz() {
                 {loading ? (
                   <>
                     <Loader2 className="w-5 h-5 animate-spin" />
-                    <span>Generating Quiz...</span>
+                    <span>{stageLabels[stage] || 'Generating Quiz...'}</span>
                   </>
                 ) : (
                   <>
@@ -162,6 +176,19 @@ function GenerateQuiz() {
               </button>
             </div>
 
+            {loading && streamedQuestions.length > 0 && (
+              <div className="mt-6 space-y-2">
+                <p className="text-sm font-medium text-gray-700">
+                  Drafting question pool: {streamedQuestions.length} of {streamedQuestions[streamedQuestions.length - 1].pool_size}
+                </p>
+                <ul className="text-sm text-gray-600 space-y-1">
+                  {streamedQuestions.map((progress, index) => (
+                    <li key={index}>• {progress.question.question}</li>
+                  ))}
+                </ul>
+              </div>
+            )}
+
             <div className="mt-6 p-4 bg-purple-50 border border-purple-200 rounded-lg">
               <h3 className="font-medium text-purple-900 mb-2">Example URLs:</h3>
               <ul className="text-sm text-purple-700 space-y-1">
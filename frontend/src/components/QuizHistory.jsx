@@ -6,7 +6,9 @@ import TakeQuizMode from './TakeQuizMode';
 
 function QuizHistory() {
   const [history, setHistory] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedQuiz, setSelectedQuiz] = useState(null);
   const [loadingQuiz, setLoadingQuiz] = useState(false);
   const [error, setError] = useState(null);
@@ -21,7 +23,8 @@ function QuizHistory() {
     setError(null);
     try {
       const data = await quizAPI.getHistory();
-      setHistory(data);
+      setHistory(data.items);
+      setNextCursor(data.next_cursor);
     } catch (err) {
       setError('Failed to load quiz history');
     } finally {
@@ -29,6 +32,19 @@ function QuizHistory() {
     }
   };
 
+  const fetchMore = async () => {
+    setLoadingMore(true);
+    try {
+      const data = await quizAPI.getHistory(nextCursor);
+      setHistory((items) => [...items, ...data.items]);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      setError('Failed to load quiz history');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleViewDetails = async (quizId) => {
     setLoadingQuiz(quizId);
     try {
@@ -157,6 +173,14 @@ function QuizHistory() {
               </tbody>
             </table>
           </div>
+
+          {nextCursor && (
+            <div className="text-center mt-6">
+              <button onClick={fetchMore} className="btn-secondary" disabled={loadingMore}>
+                {loadingMore ? <Loader2 className="w-4 h-4 animate-spin" /> : 'Load More'}
+              </button>
+            </div>
+          )}
         </div>
       ) : (
         <div>
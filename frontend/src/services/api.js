@@ -20,8 +20,31 @@ export const quizAPI = {
     return response.data;
   },
 
-  getHistory: async () => {
-    const response = await api.get('/api/quiz/history');
+  streamQuiz: async (url, { onStage, onQuestion } = {}) => {
+    const { data: job } = await api.post('/api/quiz/jobs', { url });
+    return new Promise((resolve, reject) => {
+      const source = new EventSource(`${API_BASE_URL}/api/quiz/jobs/${job.job_id}/events`);
+      source.addEventListener('stage', (event) => onStage?.(JSON.parse(event.data).stage));
+      source.addEventListener('question', (event) => onQuestion?.(JSON.parse(event.data)));
+      source.addEventListener('done', (event) => {
+        source.close();
+        resolve(JSON.parse(event.data).quiz);
+      });
+      source.addEventListener('failed', (event) => {
+        source.close();
+        reject(new Error(JSON.parse(event.data).detail));
+      });
+      source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED) {
+          reject(new Error('Lost connection to the quiz generator'));
+        }
+      };
+    });
+  },
+
+  getHistory: async (cursor = null) => {
+    const params = cursor ? { cursor } : {};
+    const response = await api.get('/api/quiz/history', { params });
     return response.data;
   },
 